@@ -10,12 +10,41 @@ from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime
 import os
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class _LazyFigures(dict):
+    """
+    Diccionario de gráficos que se construyen solo al ser accedidos
+    Cada valor se guarda como una función sin argumentos y se reemplaza
+    por la figura resultante en el primer acceso
+    """
+    
+    def __init__(self, builders: Dict[str, Callable[[], go.Figure]]):
+        super().__init__(builders)
+        self._pending = set(builders)
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key in self._pending:
+            value = value()
+            super().__setitem__(key, value)
+            self._pending.discard(key)
+        return value
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def values(self):
+        return [self[key] for key in self]
+    
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
 class InvestmentReportGenerator:
     """Generador de reportes de inversión con visualizaciones"""
     
@@ -195,7 +224,21 @@ class InvestmentReportGenerator:
     def create_performance_timeline_chart(self, df_fundamentals: pd.DataFrame, 
                                         recommendations: Dict) -> go.Figure:
         """Crea gráfico de líneas para performance temporal"""
-        recommended_companies = recommendations['distribucion'][:10]  # Top 10
+        distribution = recommendations['distribucion']
+        
+        # Top 10 por monto de inversión con selección parcial O(N); el mismo orden
+        # (monto descendente, empates en el orden original) para cualquier tamaño
+        recommended_companies = []
+        k = min(10, len(distribution))
+        if k:
+            amounts = np.array([item['Monto_Inversion'] for item in distribution], dtype=float)
+            # k-ésimo mayor monto; los empates en ese límite se toman por orden original
+            threshold = -np.partition(-amounts, k - 1)[k - 1]
+            above = np.flatnonzero(amounts > threshold)
+            ties = np.flatnonzero(amounts == threshold)[:k - len(above)]
+            top_idx = np.concatenate([above, ties])
+            top_idx = top_idx[np.argsort(-amounts[top_idx], kind='stable')]
+            recommended_companies = [distribution[i] for i in top_idx]
         
         fig = go.Figure()
         
@@ -324,7 +367,8 @@ class InvestmentReportGenerator:
         presupuesto_real = recommendations['presupuesto_total']
         total_real = recommendations['total_invertido']
         
-        analysis_text = f"""## 📊 Análisis de Inversión - {datetime.now().strftime('%d/%m/%Y')}
+        # Se acumulan fragmentos en una lista y se unen al final
+        parts = [f"""## 📊 Análisis de Inversión - {datetime.now().strftime('%d/%m/%Y')}
 
 ### 🎯 Resumen Ejecutivo
 - **Total de empresas analizadas**: {market_summary['total_empresas']}
@@ -333,57 +377,57 @@ class InvestmentReportGenerator:
 - **Total a invertir**: ${total_real:,.0f}
 - **Empresas recomendadas**: {recommendations['empresas_recomendadas']}
 
-### 💰 Top 3 Recomendaciones"""
+### 💰 Top 3 Recomendaciones"""]
         
         # Top 3 recomendaciones usando los valores CORREGIDOS
-        for i, company in enumerate(recommendations['distribucion'][:3], 1):
-            monto_real = company['Monto_Inversion']  # Ya corregido en investment_analyzer
-            porcentaje_real = company['Porcentaje_Recomendado']  # Ya corregido
-            
-            analysis_text += f"""
+        # (Monto_Inversion y Porcentaje_Recomendado ya corregidos en investment_analyzer)
+        parts.extend(
+            f"""
 
 **{i}. {company['Empresa']} ({company['Sector']})**
-- Inversión recomendada: ${monto_real:,.0f} ({porcentaje_real:.1f}%)
+- Inversión recomendada: ${company['Monto_Inversion']:,.0f} ({company['Porcentaje_Recomendado']:.1f}%)
 - Puntaje de análisis: {company['Puntaje']:.3f}"""
+            for i, company in enumerate(recommendations['distribucion'][:3], 1)
+        )
         
         # Análisis por sector usando valores CORREGIDOS
-        analysis_text += f"""
+        parts.append("""
 
-### 🏢 Distribución por Sectores"""
-        
-        for sector, data in recommendations['resumen_sectores'].items():
-            monto_sector = data['Monto_Inversion']  # Ya corregido
-            porcentaje_sector = data['Porcentaje_Recomendado']  # Ya corregido
-            analysis_text += f"\n- **{sector}**: ${monto_sector:,.0f} ({porcentaje_sector:.1f}%)"
+### 🏢 Distribución por Sectores""")
+        parts.extend(
+            f"\n- **{sector}**: ${data['Monto_Inversion']:,.0f} ({data['Porcentaje_Recomendado']:.1f}%)"
+            for sector, data in recommendations['resumen_sectores'].items()
+        )
         
         # Métricas del mercado
-        analysis_text += f"""
+        parts.append(f"""
 
 ### 📈 Métricas del Mercado
 - **Precio promedio**: ${market_summary['precio_promedio']:.2f}
 - **Variación promedio 6M**: {market_summary['variacion_promedio_6m']:.2f}%
 - **Dividend Yield promedio**: {market_summary['dividend_yield_promedio']:.2f}%
 
-### 🏆 Mejores Performers (6 meses)"""
-        
-        for performer in market_summary['top_performers_6m'][:3]:
-            analysis_text += f"\n- **{performer['Empresa']}**: {performer['Variacion_6M']*100:.1f}%"
+### 🏆 Mejores Performers (6 meses)""")
+        parts.extend(
+            f"\n- **{performer['Empresa']}**: {performer['Variacion_6M']*100:.1f}%"
+            for performer in market_summary['top_performers_6m'][:3]
+        )
         
-        analysis_text += """
+        parts.append("""
 
-### 💎 Mejores Dividendos"""
+### 💎 Mejores Dividendos""")
         
         for dividend in market_summary['mejores_dividendos'][:3]:
             # Yahoo Finance ya devuelve dividendYield como decimal, no multiplicar por 100
             yield_value = dividend['Dividend_Yield']
             if isinstance(yield_value, (int, float)) and yield_value > 1:
                 # Si el valor es mayor a 1, probablemente ya está en porcentaje
-                analysis_text += f"\n- **{dividend['Empresa']}**: {yield_value:.2f}%"
+                parts.append(f"\n- **{dividend['Empresa']}**: {yield_value:.2f}%")
             else:
                 # Si es menor a 1, convertir de decimal a porcentaje
-                analysis_text += f"\n- **{dividend['Empresa']}**: {yield_value*100:.2f}%"
+                parts.append(f"\n- **{dividend['Empresa']}**: {yield_value*100:.2f}%")
         
-        analysis_text += """
+        parts.append("""
 
 ### ⚠️ Consideraciones de Riesgo
 - La distribución busca diversificación entre sectores
@@ -392,7 +436,9 @@ class InvestmentReportGenerator:
 - Se recomienda revisar periódicamente el portafolio
 
 ---
-*Análisis generado automáticamente*"""
+*Análisis generado automáticamente*""")
+        
+        analysis_text = "".join(parts)
         
         return analysis_text.strip()
     
@@ -403,13 +449,14 @@ class InvestmentReportGenerator:
         report = {
             'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'texto_analisis': self.generate_text_analysis(df_fundamentals, recommendations, market_summary),
-            'graficos': {
-                'distribucion_portafolio': self.create_portfolio_pie_chart(recommendations),
-                'distribucion_sectores': self.create_sector_distribution_chart(recommendations),
-                'metricas_comparativas': self.create_metrics_comparison_chart(df_fundamentals, recommendations),
-                'performance_temporal': self.create_performance_timeline_chart(df_fundamentals, recommendations),
-                'riesgo_retorno': self.create_risk_return_scatter(df_fundamentals, recommendations)
-            },
+            # Los gráficos se generan solo cuando se consultan
+            'graficos': _LazyFigures({
+                'distribucion_portafolio': lambda: self.create_portfolio_pie_chart(recommendations),
+                'distribucion_sectores': lambda: self.create_sector_distribution_chart(recommendations),
+                'metricas_comparativas': lambda: self.create_metrics_comparison_chart(df_fundamentals, recommendations),
+                'performance_temporal': lambda: self.create_performance_timeline_chart(df_fundamentals, recommendations),
+                'riesgo_retorno': lambda: self.create_risk_return_scatter(df_fundamentals, recommendations)
+            }),
             'recomendaciones': recommendations,
             'resumen_mercado': market_summary
         }
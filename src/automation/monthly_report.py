@@ -5,50 +5,389 @@ Genera reporte mensual automático del mercado de acciones chileno
 """
 
 import os
+import logging
+import io
 import sys
 import smtplib
 import json
-from datetime import datetime, timedelta
+import time
+import queue
+import atexit
+import pickle
+import gzip
+import hashlib
+import functools
+import re
+import string
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-import pandas as pd
-
-# Importaciones para PDF
-from fpdf import FPDF
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
+from email.mime.application import MIMEApplication
+from email.charset import Charset, QP
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+logger = logging.getLogger(__name__)
 
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-# Importar módulos locales
-from analysis.investment_analyzer import InvestmentAnalyzer
-from analysis.report_generator import generate_investment_report
-from utils.config import get_config
+# Los módulos pesados (pandas, reportlab, analysis.*) se importan dentro de las funciones
+# que los usan, para que las ejecuciones que salen temprano (día no hábil)
+# no paguen su tiempo de carga
+
+
+SMTP_SSL_PORT = 465
+
+
+class PooledSMTP:
+    """
+    Pool de conexiones SMTP autenticadas que se reutilizan entre envíos
+    Evita repetir el handshake TLS + login en cada llamada a send_email_report
+    """
+    
+    MAX_AGE_SECONDS = 600   # Reciclar conexiones con más de 10 minutos
+    MAX_MESSAGES = 1000     # Reciclar conexiones tras N mensajes enviados
+    
+    def __init__(self, host, port, user, password, size=1, timeout=30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._idle = queue.Queue(maxsize=max(1, size))
+    
+    def _connect(self):
+        """
+        Abre una nueva sesión SMTP con TLS y autenticación
+        En el puerto 465 usa TLS implícito (SMTP_SSL), evitando el round-trip de STARTTLS
+        """
+        if self.port == SMTP_SSL_PORT:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if not isinstance(server, smtplib.SMTP_SSL):
+                server.starttls()
+            server.login(self.user, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+    
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+    
+    @staticmethod
+    def _is_alive(server):
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+    
+    @contextmanager
+    def acquire(self):
+        """Entrega una conexión sana del pool (o una nueva) y la devuelve al terminar"""
+        entry = None
+        while entry is None:
+            try:
+                server, created_at, sent = self._idle.get_nowait()
+            except queue.Empty:
+                entry = (self._connect(), time.time(), 0)
+                break
+            if self._is_alive(server):
+                entry = (server, created_at, sent)
+            else:
+                self._close(server)
+        
+        server, created_at, sent = entry
+        try:
+            yield server
+        except smtplib.SMTPServerDisconnected:
+            self._close(server)
+            raise
+        except Exception:
+            self._release(server, created_at, sent)
+            raise
+        else:
+            self._release(server, created_at, sent + 1)
+    
+    def _release(self, server, created_at, sent):
+        expired = (time.time() - created_at > self.MAX_AGE_SECONDS
+                   or sent >= self.MAX_MESSAGES)
+        if expired:
+            self._close(server)
+            return
+        try:
+            self._idle.put_nowait((server, created_at, sent))
+        except queue.Full:
+            self._close(server)
+    
+    def close_all(self):
+        """Cierra todas las conexiones inactivas del pool"""
+        while True:
+            try:
+                server, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+_smtp_pools = {}
+
+
+def get_smtp_pool(host, port, user, password):
+    """Obtiene (o crea) el pool SMTP compartido para un servidor y usuario"""
+    key = (host, port, user)
+    pool = _smtp_pools.get(key)
+    if pool is None:
+        pool = PooledSMTP(
+            host, port, user, password,
+            size=int(os.getenv('SMTP_POOL_SIZE', '1'))
+        )
+        _smtp_pools[key] = pool
+    return pool
+
+
+@atexit.register
+def _close_smtp_pools():
+    for pool in _smtp_pools.values():
+        pool.close_all()
+
+
+# Tracebacks completos solo cuando se depura (DEBUG=1)
+_DEBUG = os.getenv('DEBUG', '0').lower() in ('1', 'true')
+
+
+def _log_debug_traceback():
+    """Registra el traceback de la excepción en curso si DEBUG está activo"""
+    if not _DEBUG:
+        return False
+    logger.error("Detalles del error:", exc_info=True)
+    return True
+
+
+ANALYSIS_CACHE_DIR = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'cache', 'monthly'
+)
+
+
+def disk_memoize(cache_dir):
+    """
+    Memoiza en disco (pickle comprimido con gzip) el resultado de una función
+    para el mes en curso. La clave combina nombre de la función, año-mes y
+    argumentos (serializables a JSON). El mes se toma del argumento now
+    (el mismo que usa el resto de la ejecución), o de la hora actual si no se pasa;
+    now no se entrega a la función decorada.
+    Use REFRESH_ANALYSIS=true para ignorar el resultado guardado y
+    CACHE_TTL_HOURS para limitar su antigüedad (por defecto sin límite).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, now=None, **kwargs):
+            key_data = {
+                'func': func.__qualname__,
+                'ym': (now or datetime.now()).strftime('%Y-%m'),
+                'args': args,
+                'kwargs': kwargs
+            }
+            key = hashlib.blake2b(
+                json.dumps(key_data, sort_keys=True, default=str).encode('utf-8'),
+                digest_size=16
+            ).hexdigest()
+            cache_path = os.path.join(cache_dir, f"{key}.pkl.gz")
+            
+            refresh = os.getenv('REFRESH_ANALYSIS', 'false').lower() == 'true'
+            ttl_hours = os.getenv('CACHE_TTL_HOURS')
+            if not refresh and os.path.exists(cache_path) and ttl_hours:
+                age_hours = (time.time() - os.path.getmtime(cache_path)) / 3600
+                refresh = age_hours > float(ttl_hours)
+            
+            if not refresh and os.path.exists(cache_path):
+                try:
+                    with gzip.open(cache_path, 'rb') as f:
+                        cached = pickle.load(f)
+                    logger.info(f"💾 Resultado cargado desde caché: {cache_path}")
+                    return cached
+                except Exception as e:
+                    logger.warning(f"⚠️  Error leyendo caché {cache_path}: {str(e)}")
+            
+            value = func(*args, **kwargs)
+            
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with gzip.open(cache_path, 'wb', compresslevel=1) as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.warning(f"⚠️  Error guardando caché {cache_path}: {str(e)}")
+            
+            return value
+        return wrapper
+    return decorator
+
+
+# Cuerpo de texto en quoted-printable: legible y sin el 33% extra de base64
+BODY_CHARSET = Charset('utf-8')
+BODY_CHARSET.body_encoding = QP
+
+
+_run_lock_file = None
+
+
+def acquire_run_lock(lock_dir=ANALYSIS_CACHE_DIR):
+    """
+    Toma un lock exclusivo no bloqueante para evitar ejecuciones concurrentes
+    El lock se mantiene hasta que termina el proceso
+    
+    Returns:
+        bool: False si otra instancia ya está ejecutándose
+    """
+    global _run_lock_file
+    if fcntl is None or _run_lock_file is not None:
+        return True
+    
+    os.makedirs(lock_dir, exist_ok=True)
+    lock_file = open(os.path.join(lock_dir, 'monthly_report.lock'), 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    _run_lock_file = lock_file
+    return True
+
+
+def _completion_sentinel_path(now, state_dir=ANALYSIS_CACHE_DIR):
+    return os.path.join(state_dir, f"monthly_{now.strftime('%Y%m')}.done")
+
+
+def already_completed_today(now):
+    """Verifica si el reporte del mes ya se envió hoy"""
+    sentinel = _completion_sentinel_path(now)
+    if not os.path.exists(sentinel):
+        return False
+    return datetime.fromtimestamp(os.path.getmtime(sentinel)).date() == now.date()
+
+
+def mark_completed(now, email_sent):
+    """Registra que el reporte del mes se envió correctamente"""
+    try:
+        sentinel = _completion_sentinel_path(now)
+        os.makedirs(os.path.dirname(sentinel), exist_ok=True)
+        with open(sentinel, 'w') as f:
+            json.dump({'ts': now.isoformat(), 'email_sent': email_sent}, f)
+    except Exception as e:
+        logger.warning(f"⚠️  Error registrando ejecución completada: {str(e)}")
 
 
 def is_first_business_day():
     """Verifica si hoy es el primer día hábil del mes"""
     today = datetime.now().date()
     
-    # Obtener el primer día del mes
-    first_day = today.replace(day=1)
+    # Si el mes parte en sábado (5) o domingo (6), el primer día hábil es el lunes siguiente
+    first_weekday = today.replace(day=1).weekday()
+    offset = (7 - first_weekday) if first_weekday >= 5 else 0
+    
+    return today.day == 1 + offset
+
+
+@disk_memoize(ANALYSIS_CACHE_DIR)
+def _run_cached_analysis(config):
+    """Ejecuta el análisis con GPT (memoizado por mes y configuración)"""
+    from analysis.investment_analyzer import InvestmentAnalyzer
+    
+    analyzer = InvestmentAnalyzer()
+    return analyzer.run_complete_analysis_with_gpt(
+        budget=config['budget'],
+        risk_level=config['risk_level'],
+        dividend_preference=config['dividend_preference']
+    )
+
+
+# Campos del resultado necesarios para regenerar el reporte sin re-analizar
+SNAPSHOT_FIELDS = ('recommendations', 'market_summary', 'gpt_analysis', 'gpt_distribution')
+
+
+def _json_default(value):
+    """Convierte escalares numpy/pandas a tipos nativos para JSON"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def save_analysis_snapshot(result, config, cache_dir=ANALYSIS_CACHE_DIR, now=None):
+    """
+    Guarda los datos del análisis del mes para poder regenerar solo el reporte
+    fundamental_data se guarda en Parquet y el resto en un JSON hermano
+    """
+    import pandas as pd
+    
+    ym = (now or datetime.now()).strftime('%Y_%m')
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        fundamental_data = result.get('fundamental_data')
+        if isinstance(fundamental_data, pd.DataFrame):
+            try:
+                fundamental_data.to_parquet(
+                    os.path.join(cache_dir, f"fund_{ym}.parquet"), compression='zstd'
+                )
+            except Exception as e:
+                logger.warning(f"⚠️  No se pudo guardar fundamental_data en Parquet: {str(e)}")
+        
+        meta = {field: result.get(field) for field in SNAPSHOT_FIELDS}
+        meta['config'] = config
+        with open(os.path.join(cache_dir, f"meta_{ym}.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=_json_default)
+        
+        logger.info(f"💾 Snapshot del análisis guardado ({ym})")
+    except Exception as e:
+        logger.warning(f"⚠️  Error guardando snapshot del análisis: {str(e)}")
+
+
+def load_analysis_snapshot(cache_dir=ANALYSIS_CACHE_DIR, now=None):
+    """
+    Carga el snapshot del análisis del mes en curso
+    
+    Returns:
+        tuple: (result, config) o (None, None) si no existe
+    """
+    ym = (now or datetime.now()).strftime('%Y_%m')
+    meta_path = os.path.join(cache_dir, f"meta_{ym}.json")
+    if not os.path.exists(meta_path):
+        return None, None
     
-    # Encontrar el primer día hábil (lunes a viernes)
-    while first_day.weekday() > 4:  # 0=lunes, 6=domingo
-        first_day += timedelta(days=1)
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    config = meta.pop('config')
+    result = meta
     
-    return today == first_day
+    fund_path = os.path.join(cache_dir, f"fund_{ym}.parquet")
+    if os.path.exists(fund_path):
+        import pandas as pd
+        result['fundamental_data'] = pd.read_parquet(fund_path, engine='pyarrow')
+    
+    return result, config
 
 
-def run_monthly_analysis():
+def run_monthly_analysis(now=None):
     """Ejecuta análisis mensual completo"""
-    print(f"🚀 Iniciando análisis mensual - {datetime.now()}")
+    now = now or datetime.now()
+    logger.info(f"🚀 Iniciando análisis mensual - {now}")
     
     try:
         # Configuración predeterminada
@@ -58,79 +397,248 @@ def run_monthly_analysis():
             'dividend_preference': True
         }
         
-        # Ejecutar análisis
-        analyzer = InvestmentAnalyzer()
-        result = analyzer.run_complete_analysis_with_gpt(
-            budget=config['budget'],
-            risk_level=config['risk_level'],
-            dividend_preference=config['dividend_preference']
-        )
+        # Ejecutar análisis (reutiliza el resultado del mes si ya existe)
+        result = _run_cached_analysis(config, now=now)
+        save_analysis_snapshot(result, config, now=now)
         
-        print(f"✅ Análisis completado. Empresas analizadas: {result['market_summary']['total_empresas']}")
-        print(f"📊 Recomendaciones generadas: {result['recommendations']['empresas_recomendadas']}")
+        logger.info(f"✅ Análisis completado. Empresas analizadas: {result['market_summary']['total_empresas']}")
+        logger.info(f"📊 Recomendaciones generadas: {result['recommendations']['empresas_recomendadas']}")
         
         return result, config
         
     except Exception as e:
-        print(f"❌ Error en análisis: {str(e)}")
+        logger.error(f"❌ Error en análisis: {str(e)}")
         raise
 
 
-def generate_monthly_report_pdf(result, config):
-    """Genera reporte mensual en formato PDF profesional"""
-    print("📄 Generando reporte PDF profesional...")
+# Plantillas de texto compiladas una sola vez al importar el módulo
+REPORT_CONTENT_TPL = string.Template("""
+REPORTE MENSUAL DE INVERSIÓN - $month_year
+
+📊 RESUMEN EJECUTIVO:
+- Fecha: $fecha
+- Presupuesto: $$$presupuesto CLP
+- Perfil de riesgo: $perfil_riesgo
+- Empresas analizadas: $total_empresas
+- Recomendaciones: $recomendaciones
+
+El análisis completo se encuentra en el archivo PDF adjunto.
+
+Sistema de Análisis Automatizado - Stock Investment Advisor
+        """)
+
+EMAIL_BODY_TPL = string.Template("""
+Estimado/a inversionista,
+
+Se ha generado el reporte mensual de análisis de inversión para el 
+mercado chileno.
+
+Fecha: $fecha
+Análisis: Mercado de acciones chileno
+Presupuesto base: $$$presupuesto CLP
+
+Encuentra el reporte completo en formato PDF adjunto con:
+• Análisis detallado de todas las empresas del mercado
+• Top 10 recomendaciones de inversión
+• Distribución sugerida por sectores
+• Métricas clave del mercado
+• Análisis con Inteligencia Artificial (si está habilitada)
+
+Recordatorio: Este análisis es generado automáticamente y tiene 
+fines informativos únicamente.
+
+Saludos,
+Sistema Automatizado de Análisis de Inversión
+        """)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_report_styles():
+    """Estilos de párrafo y tabla del PDF mensual (se construyen una sola vez)"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
     
-    try:
-        # Asegurar que existe el directorio outputs/reports
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'outputs', 'reports')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Nombre del archivo PDF con ruta completa
-        pdf_filename = f"reporte_mensual_{datetime.now().strftime('%Y_%m')}.pdf"
-        pdf_path = os.path.join(output_dir, pdf_filename)
-        
-        # Crear documento PDF
-        doc = SimpleDocTemplate(
-            pdf_path,
-            pagesize=A4,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch
-        )
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
             'CustomTitle',
             parent=styles['Title'],
             fontSize=20,
             spaceAfter=30,
             textColor=colors.darkblue,
             alignment=1  # Centrado
-        )
-        heading_style = ParagraphStyle(
+        ),
+        'heading': ParagraphStyle(
             'CustomHeading',
             parent=styles['Heading1'],
             fontSize=14,
             spaceAfter=12,
             textColor=colors.darkred,
             leftIndent=0
-        )
-        normal_style = ParagraphStyle(
+        ),
+        'normal': ParagraphStyle(
             'CustomNormal',
             parent=styles['Normal'],
             fontSize=10,
             spaceAfter=6,
             leftIndent=10
+        ),
+        'disclaimer': ParagraphStyle(
+            'Disclaimer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.gray,
+            leftIndent=10,
+            rightIndent=10,
+            borderColor=colors.gray,
+            borderWidth=1,
+            borderPadding=10
+        ),
+        'top10_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+        'sector_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightcyan),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]),
+    }
+
+
+# Limpieza de markdown y emojis del texto GPT en una pasada por operación
+_MD_HEADING_RE = re.compile(r'### ')
+_GPT_TEXT_STRIP = str.maketrans('', '', '#*📊📈💹�⚖\ufe0f💎🎯')
+_MD_MARKERS_STRIP = str.maketrans('', '', '#*')
+
+
+# Filas totales a partir de las cuales conviene formatear secciones en paralelo
+PARALLEL_FORMAT_THRESHOLD = 50
+
+
+def _format_sector_rows(resumen_sectores):
+    """Filas de la tabla de distribución por sectores"""
+    return [
+        [sector, f"${data_sector['Monto_Inversion']:,}", f"{data_sector['Porcentaje_Recomendado']:.1f}%"]
+        for sector, data_sector in resumen_sectores.items()
+    ]
+
+
+def _format_top_performers(top_performers):
+    """Líneas de mejores performers (6 meses)"""
+    return [
+        f"{i}. <b>{performer['Empresa']}</b>: {performer['Variacion_6M']*100:.1f}%"
+        for i, performer in enumerate(top_performers, 1)
+    ]
+
+
+def _format_best_dividends(best_dividends):
+    """Líneas de mejores dividendos"""
+    return [
+        f"{i}. <b>{dividend['Empresa']}</b>: {dividend['Dividend_Yield']*100:.2f}%"
+        for i, dividend in enumerate(best_dividends, 1)
+    ]
+
+
+def _format_report_sections(result):
+    """
+    Formatea las secciones independientes del reporte
+    Con listas grandes se formatean en paralelo; con pocas filas el costo
+    de los hilos supera la ganancia y se hace de forma secuencial
+    """
+    tasks = [
+        (_format_sector_rows, result['recommendations']['resumen_sectores']),
+        (_format_top_performers, result['market_summary']['top_performers_6m'][:5]),
+        (_format_best_dividends, result['market_summary']['mejores_dividendos'][:5]),
+    ]
+    
+    if sum(len(arg) for _, arg in tasks) <= PARALLEL_FORMAT_THRESHOLD:
+        return [func(arg) for func, arg in tasks]
+    
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(func, arg) for func, arg in tasks]
+        return [future.result() for future in futures]
+
+
+def get_report_pdf_path(now):
+    """Ruta del PDF mensual dentro de outputs/reports"""
+    output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'outputs', 'reports')
+    return os.path.join(output_dir, f"reporte_mensual_{now.strftime('%Y_%m')}.pdf")
+
+
+def write_report_pdf(pdf_bytes, pdf_path):
+    """
+    Escribe el PDF a disco con una sola escritura
+    Se escribe a un temporal y se renombra, así nunca queda un PDF a medio escribir
+    """
+    os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+    tmp_path = pdf_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb', buffering=max(131072, len(pdf_bytes))) as pdf_file:
+            pdf_file.write(pdf_bytes)
+        os.replace(tmp_path, pdf_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_monthly_report_pdf(result, config, now=None):
+    """Genera el reporte mensual en formato PDF profesional y lo devuelve en bytes"""
+    import pandas as pd
+    
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    from reportlab.lib.units import inch
+    
+    logger.info("📄 Generando reporte PDF profesional...")
+    
+    # Una sola lectura del reloj para todo el reporte
+    now = now or datetime.now()
+    month_year = now.strftime('%B %Y').upper()
+    today_str = now.strftime('%d/%m/%Y')
+    gen_str = now.strftime('%d/%m/%Y a las %H:%M')
+    
+    try:
+        # Crear documento PDF en memoria
+        pdf_buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            pdf_buffer,
+            pagesize=A4,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            rightMargin=0.5*inch
         )
         
+        # Estilos (construidos una sola vez por proceso)
+        report_styles = _get_report_styles()
+        title_style = report_styles['title']
+        heading_style = report_styles['heading']
+        normal_style = report_styles['normal']
+        disclaimer_style = report_styles['disclaimer']
+        
         # Contenido del documento
         story = []
         
         # Título principal
         title = "REPORTE MENSUAL DE INVERSION"
-        subtitle = f"{datetime.now().strftime('%B %Y').upper()}"
+        subtitle = month_year
         story.append(Paragraph(title, title_style))
         story.append(Paragraph(subtitle, title_style))
         story.append(Spacer(1, 20))
@@ -138,12 +646,14 @@ def generate_monthly_report_pdf(result, config):
         # Resumen ejecutivo
         story.append(Paragraph("RESUMEN EJECUTIVO", heading_style))
         
-        # Crear párrafos separados para mejor renderizado
-        story.append(Paragraph(f"<b>Fecha del analisis:</b> {datetime.now().strftime('%d/%m/%Y')}", normal_style))
-        story.append(Paragraph(f"<b>Presupuesto analizado:</b> ${config['budget']:,} CLP", normal_style))
-        story.append(Paragraph(f"<b>Perfil de riesgo:</b> {config['risk_level'].title()}", normal_style))
-        story.append(Paragraph(f"<b>Total de empresas analizadas:</b> {result['market_summary']['total_empresas']}", normal_style))
-        story.append(Paragraph(f"<b>Empresas recomendadas:</b> {result['recommendations']['empresas_recomendadas']}", normal_style))
+        # Un solo párrafo por sección: menos flowables que maquetar
+        story.append(Paragraph("<br/>".join([
+            f"<b>Fecha del analisis:</b> {today_str}",
+            f"<b>Presupuesto analizado:</b> ${config['budget']:,} CLP",
+            f"<b>Perfil de riesgo:</b> {config['risk_level'].title()}",
+            f"<b>Total de empresas analizadas:</b> {result['market_summary']['total_empresas']}",
+            f"<b>Empresas recomendadas:</b> {result['recommendations']['empresas_recomendadas']}",
+        ]), normal_style))
         story.append(Spacer(1, 15))
         
         # Análisis con IA
@@ -153,10 +663,7 @@ def generate_monthly_report_pdf(result, config):
             # Procesar y dividir el contenido en párrafos separados
             gpt_text = result['gpt_analysis']
             # Limpiar markdown y emojis
-            gpt_text = gpt_text.replace('### ', '').replace('##', '').replace('#', '')
-            gpt_text = gpt_text.replace('📊', '').replace('📈', '').replace('💹', '')
-            gpt_text = gpt_text.replace('�', '').replace('⚖️', '').replace('💎', '')
-            gpt_text = gpt_text.replace('🎯', '').replace('*', '').replace('**', '')
+            gpt_text = _MD_HEADING_RE.sub('', gpt_text).translate(_GPT_TEXT_STRIP)
             
             # Dividir en líneas y procesar cada una
             lines = gpt_text.split('\n')
@@ -170,34 +677,32 @@ def generate_monthly_report_pdf(result, config):
             story.append(Paragraph("<b>ANALISIS REALIZADO CON INTELIGENCIA ARTIFICIAL</b>", normal_style))
             story.append(Spacer(1, 8))
             
-            # Agregar cada línea como párrafo separado
-            for line in clean_lines[:8]:  # Limitar a 8 líneas principales
-                if line:
-                    story.append(Paragraph(line, normal_style))
-                    story.append(Spacer(1, 4))
+            # Limitar a 8 líneas principales, en un solo párrafo
+            if clean_lines:
+                story.append(Paragraph("<br/>".join(clean_lines[:8]), normal_style))
             
             # Distribución
-            gpt_dist = result['gpt_distribution']
-            gpt_dist = gpt_dist.replace('### ', '').replace('##', '').replace('#', '')
-            gpt_dist = gpt_dist.replace('*', '')
+            gpt_dist = result['gpt_distribution'] or ''
+            gpt_dist = _MD_HEADING_RE.sub('', gpt_dist).translate(_MD_MARKERS_STRIP)
             
             story.append(Spacer(1, 10))
             story.append(Paragraph("<b>DISTRIBUCION RECOMENDADA POR IA:</b>", normal_style))
             story.append(Spacer(1, 6))
             
-            dist_lines = gpt_dist.split('\n')
-            for line in dist_lines[:6]:  # Primeras 6 líneas de distribución
-                line = line.strip()
-                if line and len(line) > 2:
-                    story.append(Paragraph(line, normal_style))
-                    story.append(Spacer(1, 3))
+            # Primeras 6 líneas de distribución
+            dist_lines = [line.strip() for line in gpt_dist.split('\n')[:6]]
+            dist_lines = [line for line in dist_lines if len(line) > 2]
+            if dist_lines:
+                story.append(Paragraph("<br/>".join(dist_lines), normal_style))
                     
         else:
             story.append(Paragraph("<b>ANALISIS IA NO DISPONIBLE</b>", normal_style))
             story.append(Spacer(1, 8))
-            story.append(Paragraph("Para habilitar analisis con IA, configure OPENAI_API_KEY", normal_style))
-            story.append(Spacer(1, 4))
-            story.append(Paragraph("Se utilizo analisis automatico basado en metricas cuantitativas", normal_style))
+            story.append(Paragraph(
+                "Para habilitar analisis con IA, configure OPENAI_API_KEY<br/>"
+                "Se utilizo analisis automatico basado en metricas cuantitativas",
+                normal_style
+            ))
         
         story.append(Spacer(1, 15))
         
@@ -207,339 +712,358 @@ def generate_monthly_report_pdf(result, config):
         # Crear tabla para recomendaciones
         data = [['#', 'Empresa', 'Sector', 'Inversion (CLP)', '%', 'Score']]
         
-        for i, company in enumerate(result['recommendations']['distribucion'][:10], 1):
-            data.append([
-                str(i),
-                f"{company['Empresa']}\n({company['Ticker']})",
-                company['Sector'],
-                f"${company['Monto_Inversion']:,}",
-                f"{company['Porcentaje_Recomendado']:.1f}%",
-                f"{company['Puntaje']:.3f}"
-            ])
+        # Top 10 por monto de inversión (selección parcial en pandas)
+        top_companies = pd.DataFrame(result['recommendations']['distribucion'])
+        if not top_companies.empty:
+            top_companies = top_companies.nlargest(10, 'Monto_Inversion')
+        
+        if not top_companies.empty:
+            # Columnas extraídas una vez y formateadas en un solo recorrido
+            columnas = zip(
+                top_companies['Empresa'].tolist(),
+                top_companies['Ticker'].tolist(),
+                top_companies['Sector'].tolist(),
+                top_companies['Monto_Inversion'].tolist(),
+                top_companies['Porcentaje_Recomendado'].tolist(),
+                top_companies['Puntaje'].tolist(),
+            )
+            data += [
+                [str(i), f"{emp}\n({ticker})", sector, f"${monto:,}", f"{pct:.1f}%", f"{score:.3f}"]
+                for i, (emp, ticker, sector, monto, pct, score) in enumerate(columnas, 1)
+            ]
         
         table = Table(data, colWidths=[0.5*inch, 2*inch, 1.5*inch, 1.3*inch, 0.7*inch, 0.7*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        table.setStyle(report_styles['top10_table'])
         story.append(table)
         story.append(Spacer(1, 15))
         
         # Distribución por sectores
         story.append(Paragraph("DISTRIBUCION POR SECTORES", heading_style))
         
-        sectores_data = [['Sector', 'Inversion (CLP)', 'Porcentaje']]
-        for sector, data_sector in result['recommendations']['resumen_sectores'].items():
-            sectores_data.append([
-                sector,
-                f"${data_sector['Monto_Inversion']:,}",
-                f"{data_sector['Porcentaje_Recomendado']:.1f}%"
-            ])
+        sector_rows, performer_lines, dividend_lines = _format_report_sections(result)
+        
+        sectores_data = [['Sector', 'Inversion (CLP)', 'Porcentaje']] + sector_rows
         
         sectores_table = Table(sectores_data, colWidths=[2.5*inch, 2*inch, 1.5*inch])
-        sectores_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightcyan),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        sectores_table.setStyle(report_styles['sector_table'])
         story.append(sectores_table)
         story.append(Spacer(1, 15))
         
         # Estado del mercado
         story.append(Paragraph("ESTADO DEL MERCADO CHILENO", heading_style))
         
-        # Crear párrafos separados para mejor renderizado
-        story.append(Paragraph(f"<b>Precio promedio de acciones:</b> ${result['market_summary']['precio_promedio']:.2f}", normal_style))
-        story.append(Paragraph(f"<b>Variacion promedio ultimos 6 meses:</b> {result['market_summary']['variacion_promedio_6m']:.2f}%", normal_style))
-        story.append(Paragraph(f"<b>Dividend yield promedio:</b> {result['market_summary']['dividend_yield_promedio']:.2f}%", normal_style))
-        story.append(Paragraph(f"<b>Empresas con dividendos:</b> {result['market_summary']['empresas_con_dividendos']}", normal_style))
+        market = result['market_summary']
+        story.append(Paragraph("<br/>".join([
+            f"<b>Precio promedio de acciones:</b> ${market['precio_promedio']:.2f}",
+            f"<b>Variacion promedio ultimos 6 meses:</b> {market['variacion_promedio_6m']:.2f}%",
+            f"<b>Dividend yield promedio:</b> {market['dividend_yield_promedio']:.2f}%",
+            f"<b>Empresas con dividendos:</b> {market['empresas_con_dividendos']}",
+        ]), normal_style))
         story.append(Spacer(1, 10))
         
         # Top performers
         story.append(Paragraph("MEJORES PERFORMERS (6 meses):", heading_style))
-        for i, performer in enumerate(result['market_summary']['top_performers_6m'][:5], 1):
-            story.append(Paragraph(f"{i}. <b>{performer['Empresa']}</b>: {performer['Variacion_6M']*100:.1f}%", normal_style))
+        if performer_lines:
+            story.append(Paragraph("<br/>".join(performer_lines), normal_style))
         story.append(Spacer(1, 10))
         
         # Mejores dividendos
         story.append(Paragraph("MEJORES DIVIDENDOS:", heading_style))
-        for i, dividend in enumerate(result['market_summary']['mejores_dividendos'][:5], 1):
-            story.append(Paragraph(f"{i}. <b>{dividend['Empresa']}</b>: {dividend['Dividend_Yield']*100:.2f}%", normal_style))
+        if dividend_lines:
+            story.append(Paragraph("<br/>".join(dividend_lines), normal_style))
         story.append(Spacer(1, 20))
         
         # Disclaimer
-        disclaimer_style = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.gray,
-            leftIndent=10,
-            rightIndent=10,
-            borderColor=colors.gray,
-            borderWidth=1,
-            borderPadding=10
-        )
-        
-        # Disclaimer
-        disclaimer_style = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.gray,
-            leftIndent=10,
-            rightIndent=10,
-            borderColor=colors.gray,
-            borderWidth=1,
-            borderPadding=10
-        )
-        
         story.append(Spacer(1, 20))
-        story.append(Paragraph("<b>IMPORTANTE - DISCLAIMER:</b>", disclaimer_style))
-        story.append(Paragraph("Este analisis es generado automaticamente con fines informativos unicamente.", disclaimer_style))
-        story.append(Paragraph("No constituye asesoria financiera profesional. Los datos se basan en informacion", disclaimer_style))
-        story.append(Paragraph("historica y pueden no reflejar condiciones futuras del mercado. Se recomienda", disclaimer_style))
-        story.append(Paragraph("consultar con un asesor financiero antes de tomar decisiones de inversion.", disclaimer_style))
-        story.append(Spacer(1, 8))
-        story.append(Paragraph(f"Reporte generado automaticamente el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}", disclaimer_style))
-        story.append(Paragraph("Sistema de Analisis Automatizado - Stock Investment Advisor", disclaimer_style))
+        story.append(Paragraph(
+            "<b>IMPORTANTE - DISCLAIMER:</b><br/>"
+            "Este analisis es generado automaticamente con fines informativos unicamente. "
+            "No constituye asesoria financiera profesional. Los datos se basan en informacion "
+            "historica y pueden no reflejar condiciones futuras del mercado. Se recomienda "
+            "consultar con un asesor financiero antes de tomar decisiones de inversion.<br/><br/>"
+            f"Reporte generado automaticamente el {gen_str}<br/>"
+            "Sistema de Analisis Automatizado - Stock Investment Advisor",
+            disclaimer_style
+        ))
         
         # Construir PDF
         doc.build(story)
         
-        print(f"✅ Reporte PDF generado: {pdf_filename}")
-        print(f"📂 Ubicación: {pdf_path}")
-        return pdf_path
+        return pdf_buffer.getvalue()
         
     except Exception as e:
-        print(f"❌ Error generando PDF: {str(e)}")
-        print("Detalles del error:")
-        import traceback
-        traceback.print_exc()
-        raise
+        logger.error(f"❌ Error generando PDF: {str(e)}")
+        _log_debug_traceback()
         raise
 
 
-def generate_monthly_report(result, config):
-    """Genera reporte mensual completo"""
-    print("📄 Generando reporte mensual...")
+def generate_monthly_report_pdf(result, config, now=None):
+    """Genera reporte mensual en formato PDF y lo guarda en outputs/reports"""
+    now = now or datetime.now()
+    pdf_path = get_report_pdf_path(now)
+    write_report_pdf(build_monthly_report_pdf(result, config, now), pdf_path)
     
-    try:
-        # Generar PDF directamente
-        pdf_filename = generate_monthly_report_pdf(result, config)
-        
-        # Crear contenido de texto simple para el email
-        report_content = f"""
-REPORTE MENSUAL DE INVERSIÓN - {datetime.now().strftime('%B %Y').upper()}
+    logger.info(f"✅ Reporte PDF generado: {os.path.basename(pdf_path)}")
+    logger.info(f"📂 Ubicación: {pdf_path}")
+    return pdf_path
 
-📊 RESUMEN EJECUTIVO:
-- Fecha: {datetime.now().strftime('%d/%m/%Y')}
-- Presupuesto: ${config['budget']:,} CLP
-- Perfil de riesgo: {config['risk_level'].title()}
-- Empresas analizadas: {result['market_summary']['total_empresas']}
-- Recomendaciones: {result['recommendations']['empresas_recomendadas']}
 
-El análisis completo se encuentra en el archivo PDF adjunto.
+def build_monthly_report_content(result, config, now):
+    """Crea el contenido de texto simple para el email"""
+    return REPORT_CONTENT_TPL.substitute(
+        month_year=now.strftime('%B %Y').upper(),
+        fecha=now.strftime('%d/%m/%Y'),
+        presupuesto=f"{config['budget']:,}",
+        perfil_riesgo=config['risk_level'].title(),
+        total_empresas=result['market_summary']['total_empresas'],
+        recomendaciones=result['recommendations']['empresas_recomendadas']
+    )
 
-Sistema de Análisis Automatizado - Stock Investment Advisor
-        """
+
+def generate_monthly_report(result, config, now=None):
+    """Genera reporte mensual completo"""
+    logger.info("📄 Generando reporte mensual...")
+    
+    now = now or datetime.now()
+    
+    try:
+        # Generar PDF directamente
+        pdf_filename = generate_monthly_report_pdf(result, config, now)
+        report_content = build_monthly_report_content(result, config, now)
         
         return report_content, pdf_filename
         
     except Exception as e:
-        print(f"❌ Error generando reporte: {str(e)}")
+        logger.error(f"❌ Error generando reporte: {str(e)}")
         raise
 
 
-def send_email_report(report_content, report_filename):
-    """Envía reporte por email"""
-    print("📧 Preparando envío de email...")
+def _get_email_settings():
+    """Lee la configuración de email desde variables de entorno"""
+    return {
+        'smtp_server': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
+        'smtp_port': int(os.getenv('SMTP_PORT') or SMTP_SSL_PORT),
+        'sender_email': os.getenv('SENDER_EMAIL'),
+        'sender_password': os.getenv('SENDER_PASSWORD'),
+        'recipient_email': os.getenv('RECIPIENT_EMAIL')
+    }
+
+
+def warm_up_smtp_pool():
+    """
+    Abre la sesión SMTP por adelantado (TLS + login) y la deja en el pool
+    Pensado para ejecutarse en segundo plano mientras corre el análisis
+    """
+    settings = _get_email_settings()
+    if not all([settings['sender_email'], settings['sender_password'],
+                settings['recipient_email']]):
+        return False
+    
+    pool = get_smtp_pool(settings['smtp_server'], settings['smtp_port'],
+                         settings['sender_email'], settings['sender_password'])
+    with pool.acquire():
+        pass
+    return True
+
+
+def send_email_report(report_content, report_filename, now=None, report_bytes=None):
+    """
+    Envía reporte por email
+    Si se entrega report_bytes se adjunta directamente sin leer report_filename
+    """
+    logger.info("📧 Preparando envío de email...")
+    
+    now = now or datetime.now()
     
     try:
         # Configuración de email (variables de entorno)
-        smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-        smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        sender_email = os.getenv('SENDER_EMAIL')
-        sender_password = os.getenv('SENDER_PASSWORD')
-        recipient_email = os.getenv('RECIPIENT_EMAIL')
+        settings = _get_email_settings()
+        smtp_server = settings['smtp_server']
+        smtp_port = settings['smtp_port']
+        sender_email = settings['sender_email']
+        sender_password = settings['sender_password']
+        recipient_email = settings['recipient_email']
         
         # Verificar configuración
         if not all([sender_email, sender_password, recipient_email]):
-            print("⚠️  Configuración de email incompleta. Saltando envío...")
-            print("   Configure las variables de entorno:")
-            print("   - SENDER_EMAIL: Email del remitente")
-            print("   - SENDER_PASSWORD: Contraseña del remitente")
-            print("   - RECIPIENT_EMAIL: Email del destinatario")
+            logger.warning("⚠️  Configuración de email incompleta. Saltando envío...")
+            logger.info("   Configure las variables de entorno:")
+            logger.info("   - SENDER_EMAIL: Email del remitente")
+            logger.info("   - SENDER_PASSWORD: Contraseña del remitente")
+            logger.info("   - RECIPIENT_EMAIL: Email del destinatario")
             return False
         
+        # Permitir varios destinatarios separados por coma
+        recipients = [r.strip() for r in recipient_email.split(',') if r.strip()]
+        
         # Crear mensaje
         message = MIMEMultipart()
         message['From'] = sender_email
-        message['To'] = recipient_email
+        message['To'] = ', '.join(recipients)
         message['Subject'] = (
             f"📊 Reporte Mensual de Inversión - "
-            f"{datetime.now().strftime('%B %Y')}"
+            f"{now.strftime('%B %Y')}"
         )
         
         # Cuerpo del email
-        body = f"""
-Estimado/a inversionista,
-
-Se ha generado el reporte mensual de análisis de inversión para el 
-mercado chileno.
-
-Fecha: {datetime.now().strftime('%d de %B de %Y')}
-Análisis: Mercado de acciones chileno
-Presupuesto base: ${200000:,} CLP
-
-Encuentra el reporte completo en formato PDF adjunto con:
-• Análisis detallado de todas las empresas del mercado
-• Top 10 recomendaciones de inversión
-• Distribución sugerida por sectores
-• Métricas clave del mercado
-• Análisis con Inteligencia Artificial (si está habilitada)
-
-Recordatorio: Este análisis es generado automáticamente y tiene 
-fines informativos únicamente.
-
-Saludos,
-Sistema Automatizado de Análisis de Inversión
-        """
+        body = EMAIL_BODY_TPL.substitute(
+            fecha=now.strftime('%d de %B de %Y'),
+            presupuesto=f"{200000:,}"
+        )
         
-        message.attach(MIMEText(body, 'plain'))
+        message.attach(MIMEText(body, 'plain', BODY_CHARSET))
         
         # Adjuntar archivo de reporte PDF
         try:
-            with open(report_filename, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
+            if report_bytes is None:
+                with open(report_filename, 'rb') as attachment:
+                    report_bytes = attachment.read()
             
-            encoders.encode_base64(part)
+            part = MIMEApplication(report_bytes, _subtype='pdf')
             part.add_header(
-                'Content-Disposition',
-                f'attachment; filename={report_filename}'
+                'Content-Disposition', 'attachment',
+                filename=os.path.basename(report_filename)
             )
             message.attach(part)
         except FileNotFoundError:
-            print(f"⚠️  Archivo de reporte no encontrado: {report_filename}")
+            logger.warning(f"⚠️  Archivo de reporte no encontrado: {report_filename}")
         
         # Enviar email con manejo de errores específico para Gmail
         try:
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            
             # Debug información de conexión
-            print(f"🔗 Conectando a: {smtp_server}:{smtp_port}")
-            print(f"👤 Usuario: {sender_email}")
-            print("🔑 Intentando autenticación...")
-            
-            server.login(sender_email, sender_password)
+            logger.info(f"🔗 Conectando a: {smtp_server}:{smtp_port}")
+            logger.info(f"👤 Usuario: {sender_email}")
+            logger.info("🔑 Intentando autenticación...")
             
-            text = message.as_string()
-            server.sendmail(sender_email, recipient_email, text)
-            server.quit()
+            pool = get_smtp_pool(smtp_server, smtp_port, sender_email, sender_password)
+            with pool.acquire() as server:
+                # Una sola transacción (MAIL FROM + RCPT por destinatario + DATA)
+                refused = server.send_message(
+                    message, from_addr=sender_email, to_addrs=recipients)
             
-            print(f"✅ Email enviado exitosamente a {recipient_email}")
+            for rejected in refused:
+                logger.warning(f"⚠️  Destinatario rechazado: {rejected}")
+            logger.info(f"✅ Email enviado exitosamente a {', '.join(recipients)}")
             return True
             
         except smtplib.SMTPAuthenticationError as e:
-            print(f"❌ Error de autenticación SMTP: {str(e)}")
-            print("💡 Para Gmail, asegúrate de:")
-            print("   1. Tener 2FA activado en tu cuenta")
-            print("   2. Usar App Password en lugar de tu contraseña normal")
-            print("   3. Generar App Password en: https://myaccount.google.com/apppasswords")
-            print("   4. Usar esa contraseña en SENDER_PASSWORD")
+            logger.error(f"❌ Error de autenticación SMTP: {str(e)}")
+            logger.info("💡 Para Gmail, asegúrate de:")
+            logger.info("   1. Tener 2FA activado en tu cuenta")
+            logger.info("   2. Usar App Password en lugar de tu contraseña normal")
+            logger.info("   3. Generar App Password en: https://myaccount.google.com/apppasswords")
+            logger.info("   4. Usar esa contraseña en SENDER_PASSWORD")
             return False
         
     except Exception as e:
-        print(f"❌ Error enviando email: {str(e)}")
-        print("Detalles del error:")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ Error enviando email: {str(e)}")
+        _log_debug_traceback()
         return False
 
 
-def cleanup_files(report_filename):
-    """Limpia archivos temporales"""
-    try:
-        if os.path.exists(report_filename):
-            os.remove(report_filename)
-            print(f"🗑️  Archivo temporal eliminado: {report_filename}")
-    except Exception as e:
-        print(f"⚠️  Error limpiando archivos: {str(e)}")
-
-
 def main():
     """Función principal del script de automatización"""
-    print("=" * 60)
-    print("🤖 SISTEMA DE ANÁLISIS AUTOMATIZADO")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("🤖 SISTEMA DE ANÁLISIS AUTOMATIZADO")
+    logger.info("=" * 60)
     
     # Verificar si se debe forzar ejecución (para testing o ejecución manual)
     force_run = os.getenv('FORCE_RUN', 'false').lower() == 'true'
     github_workflow = os.getenv('GITHUB_ACTIONS', 'false').lower() == 'true'
+    report_only = '--report-only' in sys.argv[1:]
     
-    if force_run or github_workflow:
-        print("🔧 Ejecución forzada detectada:")
-        print(f"   - FORCE_RUN: {force_run}")
-        print(f"   - GitHub Actions: {github_workflow}")
-        print("   - Omitiendo verificación de fecha")
-        print("🎯 Ejecutando análisis...")
+    if report_only:
+        logger.info("📄 Modo --report-only: se regenera el reporte desde el snapshot del mes")
+    elif force_run or github_workflow:
+        logger.info("🔧 Ejecución forzada detectada:")
+        logger.info(f"   - FORCE_RUN: {force_run}")
+        logger.info(f"   - GitHub Actions: {github_workflow}")
+        logger.info("   - Omitiendo verificación de fecha")
+        logger.info("🎯 Ejecutando análisis...")
     else:
         # Verificar si es primer día hábil (solo para ejecuciones locales)
         if not is_first_business_day():
-            print("📅 Hoy no es el primer día hábil del mes. Saliendo...")
-            print(f"   Fecha actual: {datetime.now().strftime('%d/%m/%Y - %A')}")
-            print("   💡 Para ejecutar manualmente, use:")
-            print(f"   FORCE_RUN=true python {__file__}")
+            logger.info("📅 Hoy no es el primer día hábil del mes. Saliendo...")
+            logger.info(f"   Fecha actual: {datetime.now().strftime('%d/%m/%Y - %A')}")
+            logger.info("   💡 Para ejecutar manualmente, use:")
+            logger.info(f"   FORCE_RUN=true python {__file__}")
             return
         
-        print("🎯 Es primer día hábil del mes. Ejecutando análisis...")
+        logger.info("🎯 Es primer día hábil del mes. Ejecutando análisis...")
+    
+    # Marca de tiempo única compartida por reporte y email
+    now = datetime.now()
+    
+    # Evitar duplicados: ejecuciones concurrentes o reinicios del cron el mismo día
+    if not acquire_run_lock():
+        logger.info("🔒 Otra ejecución del reporte mensual está en curso. Saliendo...")
+        return
+    
+    if not (force_run or github_workflow or report_only) and already_completed_today(now):
+        logger.info("✅ El reporte de este mes ya se envió hoy. Saliendo...")
+        return
+    
+    # Abrir la conexión SMTP en segundo plano mientras se analiza y se
+    # arma el PDF; el segundo worker prepara el texto del email
+    executor = ThreadPoolExecutor(max_workers=2)
+    smtp_warmup = executor.submit(warm_up_smtp_pool)
     
     try:
-        # 1. Ejecutar análisis
-        result, config = run_monthly_analysis()
+        # 1. Ejecutar análisis (o cargar snapshot en modo --report-only)
+        if report_only:
+            result, config = load_analysis_snapshot(now=now)
+            if result is None:
+                logger.error("❌ No existe snapshot del análisis para este mes")
+                sys.exit(1)
+        else:
+            result, config = run_monthly_analysis(now)
+        
+        # 2. Generar reporte en memoria (se guarda en disco solo con KEEP_REPORT)
+        logger.info("📄 Generando reporte mensual...")
+        content_future = executor.submit(build_monthly_report_content, result, config, now)
+        report_bytes = build_monthly_report_pdf(result, config, now)
+        report_content = content_future.result()
+        report_filename = get_report_pdf_path(now)
         
-        # 2. Generar reporte
-        report_content, report_filename = generate_monthly_report(
-            result, config)
+        # Copia en disco opcional, escrita en segundo plano mientras se envía
+        pdf_write = None
+        if os.getenv('KEEP_REPORT', 'false').lower() in ('1', 'true'):
+            pdf_write = executor.submit(write_report_pdf, report_bytes, report_filename)
         
-        # 3. Enviar por email
-        email_sent = send_email_report(report_content, report_filename)
+        # 3. Enviar por email (reutiliza la sesión precalentada si sigue viva)
+        warmup_error = smtp_warmup.exception()
+        if warmup_error is not None:
+            logger.warning(f"⚠️  No se pudo preabrir la conexión SMTP: {str(warmup_error)}")
+        email_sent = send_email_report(
+            report_content, report_filename, now, report_bytes=report_bytes)
+        if email_sent:
+            mark_completed(now, email_sent)
         
-        # 4. Limpiar archivos
-        cleanup_files(report_filename)
+        if pdf_write is not None:
+            write_error = pdf_write.exception()
+            if write_error is not None:
+                logger.warning(f"⚠️  No se pudo guardar el reporte: {str(write_error)}")
+            else:
+                logger.info(f"📂 Reporte guardado en: {report_filename}")
         
-        # 5. Resumen final
-        print("\n" + "=" * 60)
-        print("✅ PROCESO COMPLETADO EXITOSAMENTE")
-        print("=" * 60)
-        print(f"📊 Empresas analizadas: "
+        # 4. Resumen final
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ PROCESO COMPLETADO EXITOSAMENTE")
+        logger.info("=" * 60)
+        logger.info(f"📊 Empresas analizadas: "
               f"{result['market_summary']['total_empresas']}")
-        print(f"🎯 Recomendaciones: "
+        logger.info(f"🎯 Recomendaciones: "
               f"{result['recommendations']['empresas_recomendadas']}")
-        print(f"📧 Email enviado: {'Sí' if email_sent else 'No'}")
-        print(f"⏰ Tiempo: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+        logger.info(f"📧 Email enviado: {'Sí' if email_sent else 'No'}")
+        logger.info(f"⏰ Tiempo: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
         
     except Exception as e:
-        print("\n❌ ERROR CRÍTICO EN EL PROCESO:")
-        print(f"   {str(e)}")
-        print("\nDetalles para debugging:")
-        import traceback
-        traceback.print_exc()
+        logger.error("\n❌ ERROR CRÍTICO EN EL PROCESO:")
+        logger.info(f"   {str(e)}")
+        if not _log_debug_traceback():
+            logger.info("   (use DEBUG=1 para ver el traceback completo)")
+    finally:
+        executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
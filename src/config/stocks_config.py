@@ -3,6 +3,8 @@ Configuración normalizada de acciones chilenas
 Basado en analyst_2.ipynb y sistema de investment_analyzer
 """
 
+import functools
+
 # Lista completa de acciones chilenas por sectores (basada en analyst_2.ipynb)
 CHILEAN_STOCKS_BY_SECTOR = {
     # Banca y Servicios Financieros
@@ -72,10 +74,25 @@ CHILEAN_STOCKS_BY_SECTOR = {
     ]
 }
 
-# Lista plana de todas las acciones (para compatibilidad)
-ALL_CHILEAN_STOCKS = []
-for sector_stocks in CHILEAN_STOCKS_BY_SECTOR.values():
-    ALL_CHILEAN_STOCKS.extend(sector_stocks)
+# Eliminar tickers repetidos dentro de cada sector (preservando el orden)
+CHILEAN_STOCKS_BY_SECTOR = {
+    sector: list(dict.fromkeys(stocks))
+    for sector, stocks in CHILEAN_STOCKS_BY_SECTOR.items()
+}
+
+# Lista plana de todas las acciones sin duplicados (para compatibilidad)
+ALL_CHILEAN_STOCKS = list(dict.fromkeys(
+    ticker
+    for sector_stocks in CHILEAN_STOCKS_BY_SECTOR.values()
+    for ticker in sector_stocks
+))
+
+# Mapeo inverso ticker -> sector para búsquedas O(1)
+_TICKER_TO_SECTOR = {
+    ticker: sector
+    for sector, stocks in CHILEAN_STOCKS_BY_SECTOR.items()
+    for ticker in stocks
+}
 
 # Mapeo de símbolos a nombres para display
 STOCK_NAMES = {
@@ -150,6 +167,7 @@ def get_stocks_by_sector(sector: str = None):
         return CHILEAN_STOCKS_BY_SECTOR.get(sector, [])
     return CHILEAN_STOCKS_BY_SECTOR
 
+@functools.lru_cache(maxsize=256)
 def get_stock_name(ticker: str) -> str:
     """
     Obtiene el nombre display de una acción
@@ -160,6 +178,7 @@ def get_stock_name(ticker: str) -> str:
     """
     return STOCK_NAMES.get(ticker, ticker.replace(".SN", ""))
 
+@functools.lru_cache(maxsize=256)
 def get_sector_for_stock(ticker: str) -> str:
     """
     Obtiene el sector de una acción específica
@@ -168,7 +187,4 @@ def get_sector_for_stock(ticker: str) -> str:
     Returns:
         Nombre del sector
     """
-    for sector, stocks in CHILEAN_STOCKS_BY_SECTOR.items():
-        if ticker in stocks:
-            return sector
-    return "Otros"
+    return _TICKER_TO_SECTOR.get(ticker, "Otros")
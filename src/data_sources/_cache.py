@@ -0,0 +1,79 @@
+"""
+Caché en disco con expiración (TTL) para respuestas de Yahoo Finance
+Guarda cada valor en un archivo pickle con su marca de tiempo
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Caché clave -> valor persistido en disco con tiempo de vida por entrada
+    Las entradas vencidas se tratan como ausentes y se eliminan al leerlas.
+    Las lecturas recientes se guardan también en memoria (hasta memory_ttl
+    segundos) para no deserializar el mismo archivo en cada consulta
+    """
+
+    def __init__(self, cache_dir, memory_ttl: float = 300):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_ttl = memory_ttl
+        self._memory = {}  # clave -> (vencimiento en time.monotonic(), valor)
+
+    def _remember(self, key: str, value: Any, ttl: float):
+        self._memory[key] = (time.monotonic() + min(ttl, self.memory_ttl), value)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna el valor guardado o None si no existe o venció"""
+        hit = self._memory.get(key)
+        if hit is not None:
+            if hit[0] > time.monotonic():
+                return hit[1]
+            self._memory.pop(key, None)
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning("Error leyendo caché %s: %s", path.name, e)
+            return None
+
+        if entry['ts'] + entry['ttl'] < time.time():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        self._remember(key, entry['payload'], entry['ts'] + entry['ttl'] - time.time())
+        return entry['payload']
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Guarda un valor con un tiempo de vida de ttl segundos"""
+        self._remember(key, value, ttl)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'ts': time.time(), 'ttl': ttl, 'payload': value}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Error guardando caché %s: %s", path.name, e)
+            if tmp_path.exists():
+                tmp_path.unlink()
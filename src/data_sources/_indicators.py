@@ -0,0 +1,184 @@
+"""
+Cálculo fusionado de indicadores técnicos sobre la serie de cierres
+Un solo recorrido del arreglo con sumas móviles y EWMA recursivas,
+compilado con Numba cuando está disponible
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+INDICATOR_COLUMNS = (
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26',
+    'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'RSI', 'BB_Middle', 'BB_Upper', 'BB_Lower',
+    'Daily_Return', 'Volatility',
+)
+
+
+def _compute(close):
+    """
+    Calcula todos los indicadores en una pasada (misma semántica que pandas:
+    rolling con ventana completa, ewm(span) con adjust=True, std con ddof=1)
+    Entrada y salida en float32; los acumuladores se llevan en float64 porque
+    la varianza por sumas de cuadrados pierde precisión en simple precisión
+    """
+    n = close.shape[0]
+    out = np.full((13, n), np.nan, dtype=np.float32)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    num12 = den12 = num26 = den26 = num9 = den9 = 0.0
+
+    # Ventanas móviles: suma y conteo de valores válidos
+    s20 = sq20 = 0.0
+    c20 = 0
+    s50 = 0.0
+    c50 = 0
+    a14 = 1.0 / 14.0
+    roll_up = roll_dn = 0.0
+    ret_s = ret_sq = 0.0
+    ret_c = 0
+    rets = np.full(n, np.nan)
+
+    sqrt_252 = math.sqrt(252.0)
+    last_valid = np.nan
+    for i in range(n):
+        x = np.float64(close[i])
+        valid = not math.isnan(x)
+
+        # Medias móviles simples y desviación para Bollinger
+        if valid:
+            s20 += x
+            sq20 += x * x
+            c20 += 1
+            s50 += x
+            c50 += 1
+        if i >= 20:
+            old = np.float64(close[i - 20])
+            if not math.isnan(old):
+                s20 -= old
+                sq20 -= old * old
+                c20 -= 1
+        if i >= 50:
+            old = np.float64(close[i - 50])
+            if not math.isnan(old):
+                s50 -= old
+                c50 -= 1
+        if c20 == 20:
+            mean20 = s20 / 20.0
+            var20 = max((sq20 - s20 * mean20) / 19.0, 0.0)
+            std20 = math.sqrt(var20)
+            out[0, i] = mean20
+            out[8, i] = mean20
+            out[9, i] = mean20 + 2.0 * std20
+            out[10, i] = mean20 - 2.0 * std20
+        if c50 == 50:
+            out[1, i] = s50 / 50.0
+
+        # EMAs (adjust=True): numerador y denominador con decaimiento
+        num12 *= 1.0 - a12
+        den12 *= 1.0 - a12
+        num26 *= 1.0 - a26
+        den26 *= 1.0 - a26
+        if valid:
+            num12 += x
+            den12 += 1.0
+            num26 += x
+            den26 += 1.0
+        if den12 > 0.0:
+            ema12 = num12 / den12
+            ema26 = num26 / den26
+            macd = ema12 - ema26
+            num9 = num9 * (1.0 - a9) + macd
+            den9 = den9 * (1.0 - a9) + 1.0
+            signal = num9 / den9
+            out[2, i] = ema12
+            out[3, i] = ema26
+            out[4, i] = macd
+            out[5, i] = signal
+            out[6, i] = macd - signal
+
+        # RSI: suavizado de Wilder (ewm con alpha=1/14, adjust=False)
+        up = dn = 0.0
+        if i > 0:
+            delta = x - np.float64(close[i - 1])
+            if delta > 0:
+                up = delta
+            elif delta < 0:
+                dn = -delta
+        if i == 0:
+            roll_up = up
+            roll_dn = dn
+        else:
+            roll_up = (1.0 - a14) * roll_up + a14 * up
+            roll_dn = (1.0 - a14) * roll_dn + a14 * dn
+        if i >= 13:
+            if roll_dn > 0.0:
+                out[7, i] = 100.0 - 100.0 / (1.0 + roll_up / roll_dn)
+            elif roll_up > 0.0:
+                out[7, i] = 100.0
+
+        # Retorno diario (sobre cierres rellenados hacia adelante) y volatilidad anualizada:
+        # suma y suma de cuadrados móviles de los retornos, O(1) por paso
+        if i > 0 and not math.isnan(last_valid):
+            current = x if valid else last_valid
+            rets[i] = current / last_valid - 1.0
+        if valid:
+            last_valid = x
+        out[11, i] = rets[i]
+        r = rets[i]
+        if not math.isnan(r):
+            ret_s += r
+            ret_sq += r * r
+            ret_c += 1
+        if i >= 20:
+            old = rets[i - 20]
+            if not math.isnan(old):
+                ret_s -= old
+                ret_sq -= old * old
+                ret_c -= 1
+        if ret_c == 20:
+            mean_r = ret_s / 20.0
+            var_r = max((ret_sq - ret_s * mean_r) / 19.0, 0.0)
+            out[12, i] = math.sqrt(var_r) * sqrt_252
+
+    return out
+
+
+def _ema_macd_last(close):
+    """
+    Último EMA_12, EMA_26 y señal MACD (adjust=True) sin construir las series
+    Solo mantiene el estado de las recurrencias; la entrada no debe tener NaN
+    """
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    num12 = den12 = num26 = den26 = num9 = den9 = 0.0
+    for i in range(close.shape[0]):
+        x = close[i]
+        num12 = num12 * (1.0 - a12) + x
+        den12 = den12 * (1.0 - a12) + 1.0
+        num26 = num26 * (1.0 - a26) + x
+        den26 = den26 * (1.0 - a26) + 1.0
+        num9 = num9 * (1.0 - a9) + (num12 / den12 - num26 / den26)
+        den9 = den9 * (1.0 - a9) + 1.0
+    return num12 / den12, num26 / den26, num9 / den9
+
+
+if NUMBA_AVAILABLE:
+    # Sin fastmath: el kernel depende de isnan para replicar el manejo de NaN de pandas.
+    # nogil: libera el GIL durante el cálculo, así varios threads (sesiones de Streamlit,
+    # pool del extractor) calculan indicadores en paralelo sin procesos extra
+    compute = njit(cache=True, nogil=True)(_compute)
+    ema_macd_last = njit(cache=True, nogil=True)(_ema_macd_last)
+else:
+    compute = _compute
+    ema_macd_last = _ema_macd_last
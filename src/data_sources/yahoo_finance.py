@@ -5,30 +5,151 @@ Incluye precios, indicadores técnicos, y datos fundamentales
 
 import yfinance as yf
 import pandas as pd
+import requests
+import httpx
+import asyncio
+from requests.adapters import HTTPAdapter
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import itertools
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 from pathlib import Path
 import json
 import time
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from data_sources._cache import TTLCache
+    from data_sources._indicators import NUMBA_AVAILABLE, INDICATOR_COLUMNS, compute as compute_indicators, ema_macd_last
+except ImportError:  # Ejecución directa del módulo
+    from _cache import TTLCache
+    from _indicators import NUMBA_AVAILABLE, INDICATOR_COLUMNS, compute as compute_indicators, ema_macd_last
+
+# Logger del módulo; la configuración (handlers, nivel) queda a cargo de la aplicación
 logger = logging.getLogger(__name__)
 
 # Suprimir advertencias de yfinance
 warnings.filterwarnings('ignore', category=FutureWarning)
 
 
+def _write_csv(df: pd.DataFrame, filepath, index: bool = True):
+    """Escribe un DataFrame a CSV (misma firma que el writer de Parquet)"""
+    # Fin de línea fijo (sin detección por SO) y escritura por bloques para los históricos
+    df.to_csv(filepath, index=index, lineterminator='\n', chunksize=50000)
+
+
+def _load_json(path):
+    """Lee un archivo JSON del caché con orjson (json estándar si no está)"""
+    if not HAS_ORJSON:
+        with open(path, 'r') as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _dump_json(data, path):
+    """Escribe un archivo JSON del caché con orjson (json estándar si no está)"""
+    if not HAS_ORJSON:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+# Pool de threads compartido por todos los extractores; se crea al primer uso y vive
+# con el proceso, así crear extractores (p. ej. en cada rerun de Streamlit) no deja threads
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _shared_pool() -> ThreadPoolExecutor:
+    """Retorna el pool de threads del módulo, creándolo si aún no existe"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='yf')
+        return _pool
+
+
+# Señal (type, indicator, strength) de cada estado por indicador, en el orden de
+# salida: medias móviles, RSI, MACD y Bollinger. None = estado sin señal
+_SIGNAL_GROUPS = (
+    (None, ('Bullish', 'Moving Average', 'Strong'), ('Bullish', 'Moving Average', 'Moderate'),
+     ('Bearish', 'Moving Average', 'Strong')),
+    (None, ('Bearish', 'RSI', 'Overbought'), ('Bullish', 'RSI', 'Oversold')),
+    (('Bullish', 'MACD', 'Positive Crossover'), ('Bearish', 'MACD', 'Negative Crossover')),
+    (None, ('Bearish', 'Bollinger Bands', 'Above Upper Band'), ('Bullish', 'Bollinger Bands', 'Below Lower Band')),
+)
+
+# Lista de señales ya armada para cada combinación de estados (4 x 3 x 2 x 3)
+_SIGNAL_TABLE = {
+    states: tuple(
+        {'type': signal[0], 'indicator': signal[1], 'strength': signal[2]}
+        for signal in (group[state] for group, state in zip(_SIGNAL_GROUPS, states))
+        if signal is not None
+    )
+    for states in itertools.product(*(range(len(group)) for group in _SIGNAL_GROUPS))
+}
+
+
 class YahooFinanceDataExtractor:
     """
     Extractor de datos financieros desde Yahoo Finance
     Optimizado para acciones del mercado chileno con sistema de caché diario
     """
     
+    __slots__ = (
+        'default_stocks', 'stock_names', '_name_series', '_clean_symbols', 'cache_dir',
+        '_yf_cache', '_prices_cache', '_pool', '_session',
+        '_hist_mem', '_info_mem', '_today',
+        '_ticker_info', '_ticker_info_path', '_ticker_info_dirty', '_price_manifest',
+        '_state_lock',
+    )
+    
+    # Tiempo de vida (segundos) de las respuestas cacheadas de yfinance
+    INFO_TTL = 24 * 3600
+    HISTORY_TTL = 3600
+    PRICES_MEMO_TTL = 60  # Reutilizar precios en memoria dentro de una misma ejecución
+    
+    # Formato del caché diario: Parquet columnar (zstd), mucho más rápido de leer que CSV
+    CACHE_SUFFIX = ".parquet"
+    
+    # Campos de .info que se guardan en el sidecar JSON diario
+    TICKER_INFO_FIELDS = ('marketCap', 'currency', 'sector', 'industry')
+    
+    # Columnas de precio que se guardan en float32, igual que los indicadores
+    PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+    
+    # Indicadores (última fila) que usan las reglas de get_trading_signals_bulk
+    SIGNAL_INDICATORS = ('Close', 'SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'BB_Upper', 'BB_Lower')
+    
+    # Categorías fijas de las columnas de etiquetas de señales (se guardan como códigos uint8)
+    SIGNAL_TYPES = ('Bullish', 'Bearish')
+    SIGNAL_SOURCES = ('Moving Average', 'RSI', 'MACD', 'Bollinger Bands')
+    SIGNAL_STRENGTHS = (
+        'Strong', 'Moderate', 'Overbought', 'Oversold',
+        'Positive Crossover', 'Negative Crossover', 'Above Upper Band', 'Below Lower Band',
+    )
+    
+    # Endpoint de gráficos de Yahoo (el mismo que usa yfinance internamente)
+    CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    
     def __init__(self):
         self.default_stocks = [
             "LTM.SN",         # LATAM Airlines
@@ -56,11 +177,308 @@ class YahooFinanceDataExtractor:
             "ENELCHILE.SN": "Enel Chile",
             "HABITAT.SN": "AFP Habitat",
         }
+        # Mismo mapeo como Series para asignar nombres vectorizados con .map
+        self._name_series = pd.Series(self.stock_names)
+        # Símbolos limpios para nombres de archivo, calculados una sola vez
+        self._clean_symbols = {symbol: self._clean_symbol(symbol) for symbol in self.stock_names}
         
         # Configuración de caché
         self.cache_dir = Path("data/cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._cleanup_old_cache_files()
+        self._yf_cache = TTLCache(self.cache_dir / "yf")
+        self._prices_cache = {}  # (símbolos ordenados, use_cache) -> (timestamp, DataFrame)
+        
+        # Día del caché diario y memos en memoria: (símbolo, período) -> histórico y símbolo -> info
+        self._hist_mem = {}
+        self._info_mem = {}
+        self._today = datetime.now().strftime('%Y%m%d')
+        
+        # Sidecar JSON del día con los metadatos livianos de .info de cada acción
+        self._ticker_info_path = self.cache_dir / f"ticker_info_{self._today}.json"
+        self._ticker_info = self._load_ticker_info()
+        self._ticker_info_dirty = False
+        
+        # Protege el cambio de día y el sidecar: el extractor se comparte entre sesiones
+        # de Streamlit y _info se llama desde los threads del pool
+        self._state_lock = threading.RLock()
+        
+        # Símbolos con precios cacheados hoy; se arma al primer uso con un solo scandir
+        self._price_manifest = None
+        
+        # Pool de threads del módulo, compartido con los demás extractores
+        self._pool = _shared_pool()
+        
+        # Sesión HTTP compartida: reutiliza conexiones TCP/TLS entre consultas
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = 'Mozilla/5.0'
+        self._session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=3))
+    
+    def close(self):
+        """Guarda el sidecar de metadatos y cierra la sesión HTTP (el pool es del módulo)"""
+        self._flush_ticker_info()
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _refresh_today(self) -> str:
+        """
+        Fecha (YYYYMMDD) compartida por todas las claves del caché diario
+        Al cambiar el día vacía las memos en memoria y cambia de sidecar de metadatos
+        """
+        today = datetime.now().strftime('%Y%m%d')
+        if today != self._today:
+            with self._state_lock:
+                if today != self._today:
+                    self._flush_ticker_info()
+                    self._hist_mem.clear()
+                    self._info_mem.clear()
+                    self._ticker_info_path = self.cache_dir / f"ticker_info_{today}.json"
+                    self._ticker_info = self._load_ticker_info()
+                    self._price_manifest = None
+                    self._today = today
+        return today
+    
+    def _load_ticker_info(self) -> Dict:
+        """Carga el sidecar JSON de metadatos del día (vacío si no existe)"""
+        if self._ticker_info_path.exists():
+            try:
+                return _load_json(self._ticker_info_path)
+            except Exception as e:
+                logger.warning("Error cargando metadatos de acciones: %s", e)
+        return {}
+    
+    def _flush_ticker_info(self):
+        """Escribe el sidecar JSON si se agregaron metadatos nuevos"""
+        with self._state_lock:
+            if not self._ticker_info_dirty:
+                return
+            tmp_path = self._ticker_info_path.with_suffix('.tmp')
+            try:
+                _dump_json(self._ticker_info, tmp_path)
+                os.replace(tmp_path, self._ticker_info_path)
+                self._ticker_info_dirty = False
+            except Exception as e:
+                logger.warning("Error guardando metadatos de acciones: %s", e)
+    
+    @staticmethod
+    def _clean_symbol(symbol: str) -> str:
+        """Símbolo usable en nombres de archivo (sin sufijo .SN ni guiones)"""
+        return symbol.replace('.SN', '').replace('-', '_')
+    
+    def _map_names(self, symbols: pd.Series) -> pd.Series:
+        """Nombre de cada símbolo (el propio símbolo si no está mapeado)"""
+        return symbols.map(self._name_series).fillna(symbols)
+    
+    def _info(self, symbol: str) -> Dict:
+        """yf.Ticker(symbol).info con caché en disco (TTL de 24 horas)"""
+        key = f"{symbol}:info:"
+        info = self._yf_cache.get(key)
+        if info is None:
+            info = yf.Ticker(symbol).info
+            if info:
+                self._yf_cache.set(key, info, self.INFO_TTL)
+        if info and symbol not in self._ticker_info:
+            # Se escribe apenas cambia: no depender de close()/atexit (no corren con SIGTERM)
+            with self._state_lock:
+                if symbol not in self._ticker_info:
+                    self._ticker_info[symbol] = {k: info[k] for k in self.TICKER_INFO_FIELDS if k in info}
+                    self._ticker_info_dirty = True
+                    self._flush_ticker_info()
+        return info
+    
+    def _history(self, symbol: str, period: str) -> pd.DataFrame:
+        """yf.Ticker(symbol).history(period) con caché en disco (TTL de 1 hora)"""
+        key = f"{symbol}:history:{period}"
+        hist = self._yf_cache.get(key)
+        if hist is None:
+            try:
+                hist = self._chart(symbol, period)
+            except Exception as e:
+                logger.warning("Error consultando chart API para %s, usando yfinance: %s", symbol, e)
+                hist = pd.DataFrame()
+            if hist.empty:
+                hist = yf.Ticker(symbol).history(period=period)
+            if not hist.empty:
+                self._yf_cache.set(key, hist, self.HISTORY_TTL)
+        return hist.copy()
+    
+    def _chart(self, symbol: str, period: str) -> pd.DataFrame:
+        """Histórico diario desde el chart API de Yahoo usando la sesión compartida"""
+        response = self._session.get(
+            self.CHART_URL.format(symbol=symbol),
+            params={'range': period, 'interval': '1d', 'events': 'div,splits'},
+            timeout=15
+        )
+        response.raise_for_status()
+        return self._parse_chart(response.json())
+    
+    @staticmethod
+    def _parse_chart(payload: Dict) -> pd.DataFrame:
+        """
+        Convierte la respuesta del chart API al formato de Ticker.history()
+        (precios ajustados por dividendos, columnas Dividends y Stock Splits)
+        """
+        result = (payload.get('chart') or {}).get('result') or []
+        if not result or not result[0].get('timestamp'):
+            return pd.DataFrame()
+        result = result[0]
+        
+        timezone = result.get('meta', {}).get('exchangeTimezoneName', 'UTC')
+        index = pd.to_datetime(result['timestamp'], unit='s', utc=True).tz_convert(timezone).normalize()
+        index.name = 'Date'
+        
+        quote = result['indicators']['quote'][0]
+        hist = pd.DataFrame({
+            'Open': quote.get('open'),
+            'High': quote.get('high'),
+            'Low': quote.get('low'),
+            'Close': quote.get('close'),
+            'Volume': quote.get('volume'),
+        }, index=index, dtype='float64')
+        
+        # Ajuste por dividendos/splits igual que auto_adjust=True
+        adjclose = result['indicators'].get('adjclose')
+        if adjclose:
+            ratio = np.asarray(adjclose[0]['adjclose'], dtype='float64') / hist['Close'].to_numpy()
+            for column in ('Open', 'High', 'Low', 'Close'):
+                hist[column] = hist[column].to_numpy() * ratio
+        
+        events = result.get('events', {})
+        dividends = pd.Series(0.0, index=index)
+        for event in events.get('dividends', {}).values():
+            date = pd.Timestamp(event['date'], unit='s', tz='UTC').tz_convert(timezone).normalize()
+            if date in dividends.index:
+                dividends[date] = event['amount']
+        splits = pd.Series(0.0, index=index)
+        for event in events.get('splits', {}).values():
+            date = pd.Timestamp(event['date'], unit='s', tz='UTC').tz_convert(timezone).normalize()
+            if date in splits.index:
+                splits[date] = event['numerator'] / event['denominator']
+        hist['Dividends'] = dividends
+        hist['Stock Splits'] = splits
+        
+        # La barra del día en curso puede venir repetida
+        hist = hist[~hist.index.duplicated(keep='last')]
+        return hist.dropna(subset=['Close'])
+    
+    async def _afetch_chart(self, client: httpx.AsyncClient, symbol: str, period: str) -> pd.DataFrame:
+        """Versión asíncrona de _chart"""
+        response = await client.get(
+            self.CHART_URL.format(symbol=symbol),
+            params={'range': period, 'interval': '1d', 'events': 'div,splits'}
+        )
+        response.raise_for_status()
+        return self._parse_chart(response.json())
+    
+    async def _gather_charts(self, symbols: List[str], period: str) -> list:
+        limits = httpx.Limits(max_connections=32)
+        async with httpx.AsyncClient(headers={'User-Agent': 'Mozilla/5.0'}, timeout=15,
+                                     limits=limits) as client:
+            return await asyncio.gather(
+                *[self._afetch_chart(client, symbol, period) for symbol in symbols],
+                return_exceptions=True
+            )
+    
+    def _fetch_charts(self, symbols: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        """
+        Descarga concurrente de históricos desde el chart API (un solo event loop)
+        Retorna solo los símbolos obtenidos con datos
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(self._gather_charts(symbols, period))
+        else:
+            # Ya hay un event loop en este thread (p.ej. Jupyter): usar otro thread
+            results = self._pool.submit(asyncio.run, self._gather_charts(symbols, period)).result()
+        
+        charts = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning("Error consultando chart API para %s: %s", symbol, result)
+            elif not result.empty:
+                charts[symbol] = result
+        return charts
+    
+    def _history_panel(self, symbols: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        """
+        Históricos OHLCV de varias acciones
+        Los símbolos que faltan en el caché TTL de _history se piden en paralelo al
+        chart API (asyncio); los que fallen se descargan en un solo yf.download
+        """
+        histories = {}
+        missing = []
+        for symbol in symbols:
+            hist = self._yf_cache.get(f"{symbol}:history:{period}")
+            if hist is None:
+                missing.append(symbol)
+            else:
+                histories[symbol] = hist.copy()
+        
+        if missing:
+            for symbol, hist in self._fetch_charts(missing, period).items():
+                self._yf_cache.set(f"{symbol}:history:{period}", hist, self.HISTORY_TTL)
+                histories[symbol] = hist.copy()
+            missing = [s for s in missing if s not in histories]
+        
+        if missing:
+            try:
+                panel = yf.download(
+                    missing, period=period, group_by='ticker', auto_adjust=True,
+                    actions=True, threads=True, progress=False
+                )
+            except Exception as e:
+                logger.error("Error descargando datos históricos: %s", e)
+                panel = pd.DataFrame()
+            
+            if not panel.empty and not isinstance(panel.columns, pd.MultiIndex):
+                panel = pd.concat({missing[0]: panel}, axis=1)
+            
+            downloaded = set(panel.columns.get_level_values(0)) if not panel.empty else set()
+            for symbol in missing:
+                if symbol not in downloaded:
+                    continue
+                hist = panel[symbol].dropna(subset=['Close'])
+                if hist.empty:
+                    continue
+                hist.columns.name = None
+                self._yf_cache.set(f"{symbol}:history:{period}", hist, self.HISTORY_TTL)
+                histories[symbol] = hist.copy()
+        
+        return histories
+    
+    def _download_panel(self, symbols: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        """Históricos con indicadores técnicos de varias acciones (descarga batch)"""
+        historical_data = {}
+        for symbol, hist in self._history_panel(symbols, period).items():
+            historical_data[symbol] = self._finalize_historical(symbol, hist)
+        
+        for symbol in symbols:
+            if symbol not in historical_data:
+                logger.warning("No hay datos históricos para %s", symbol)
+        return historical_data
+    
+    def _finalize_historical(self, symbol: str, hist: pd.DataFrame) -> pd.DataFrame:
+        """
+        Añade indicadores técnicos y columnas de identificación a un histórico
+        El DataFrame se arma por bloques con pd.concat: insertar columna por columna
+        costaba más que el cálculo de los indicadores
+        """
+        # float32 basta para precios con 2 decimales y reduce a la mitad la memoria;
+        # Volume queda como está porque float32 no es exacto sobre ~16,7 millones
+        prices = [column for column in self.PRICE_COLUMNS if column in hist.columns]
+        hist = pd.concat([
+            pd.DataFrame(hist[prices].to_numpy(dtype=np.float32), index=hist.index, columns=prices),
+            hist.drop(columns=prices),
+        ], axis=1)
+        hist = self._add_technical_indicators(hist)
+        ids = pd.DataFrame({'symbol': symbol, 'name': self.stock_names.get(symbol, symbol)}, index=hist.index)
+        return pd.concat([hist, ids], axis=1)
     
     def _cleanup_old_cache_files(self):
         """Limpia archivos de caché antiguos (más de 7 días)"""
@@ -68,72 +486,131 @@ class YahooFinanceDataExtractor:
             if not self.cache_dir.exists():
                 return
             
-            current_time = time.time()
-            for cache_file in self.cache_dir.glob("*.csv"):
-                if current_time - cache_file.stat().st_mtime > 7 * 24 * 3600:
-                    cache_file.unlink()
-                    logger.info(f"Archivo de caché eliminado: {cache_file.name}")
+            cutoff = time.time() - 7 * 24 * 3600
+            # Incluye los .csv del formato anterior y los .json diarios
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.csv', '.json', self.CACHE_SUFFIX)):
+                        continue
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        logger.info("Archivo de caché eliminado: %s", entry.name)
+            
+            # Directorios diarios del caché de precios (un archivo por acción)
+            prices_dir = self.cache_dir / "prices"
+            if prices_dir.exists():
+                with os.scandir(prices_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                            shutil.rmtree(entry.path)
+                            logger.info("Caché de precios eliminado: %s", entry.name)
         except Exception as e:
-            logger.warning(f"Error limpiando caché: {e}")
+            logger.warning("Error limpiando caché: %s", e)
     
     def _get_cache_filename(self, data_type: str, symbols: str = "default") -> str:
         """Genera nombre de archivo de caché basado en fecha y tipo de datos"""
-        today = datetime.now().strftime('%Y%m%d')
-        return f"{data_type}_{symbols}_{today}.csv"
+        today = self._refresh_today()
+        return f"{data_type}_{symbols}_{today}{self.CACHE_SUFFIX}"
     
     def _load_from_cache(self, cache_filename: str) -> Optional[pd.DataFrame]:
         """Carga datos desde el caché si existe"""
         cache_path = self.cache_dir / cache_filename
         if cache_path.exists():
             try:
-                logger.info(f"Cargando desde caché: {cache_filename}")
-                return pd.read_csv(cache_path, index_col=0, parse_dates=True)
+                logger.info("Cargando desde caché: %s", cache_filename)
+                return pd.read_parquet(cache_path, engine='pyarrow')
             except Exception as e:
-                logger.warning(f"Error cargando caché {cache_filename}: {e}")
+                logger.warning("Error cargando caché %s: %s", cache_filename, e)
         return None
     
     def _save_to_cache(self, data: pd.DataFrame, cache_filename: str):
         """Guarda datos en el caché"""
         try:
             cache_path = self.cache_dir / cache_filename
-            data.to_csv(cache_path)
-            logger.info(f"Datos guardados en caché: {cache_filename}")
+            data.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=True)
+            logger.info("Datos guardados en caché: %s", cache_filename)
+        except Exception as e:
+            logger.warning("Error guardando en caché %s: %s", cache_filename, e)
+    
+    def _prices_day_dir(self) -> Path:
+        """Directorio del caché de precios del día (un Parquet por acción)"""
+        return self.cache_dir / "prices" / self._refresh_today()
+    
+    def _get_price_manifest(self) -> set:
+        """Símbolos con archivo en el caché de precios del día (escanea el directorio una vez)"""
+        day_dir = self._prices_day_dir()
+        if self._price_manifest is None:
+            manifest = set()
+            if day_dir.exists():
+                with os.scandir(day_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(self.CACHE_SUFFIX):
+                            manifest.add(entry.name[:-len(self.CACHE_SUFFIX)])
+            self._price_manifest = manifest
+        return self._price_manifest
+    
+    def _save_prices_cache(self, data: pd.DataFrame):
+        """Guarda cada acción en su propio archivo: agregar acciones no reescribe las demás"""
+        try:
+            day_dir = self._prices_day_dir()
+            day_dir.mkdir(parents=True, exist_ok=True)
+            manifest = self._get_price_manifest()
+            for symbol, row in data.groupby('symbol', sort=False):
+                row.to_parquet(day_dir / f"{symbol}{self.CACHE_SUFFIX}",
+                               engine='pyarrow', compression='zstd', index=False)
+                manifest.add(symbol)
+            logger.info("Precios guardados en caché: %s acciones", len(data))
         except Exception as e:
-            logger.warning(f"Error guardando en caché {cache_filename}: {e}")
+            logger.warning("Error guardando precios en caché: %s", e)
     
     def get_cache_info(self) -> Dict:
         """Obtiene información sobre el estado del caché"""
         try:
-            cache_files = list(self.cache_dir.glob("*.csv"))
-            total_size = sum(f.stat().st_size for f in cache_files) / (1024 * 1024)
-            
-            files_info = []
-            for cache_file in sorted(cache_files, key=lambda f: f.stat().st_mtime, reverse=True):
-                stat = cache_file.stat()
-                files_info.append({
-                    'filename': cache_file.name,
-                    'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                    'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                })
+            # Un solo stat por archivo: (nombre, tamaño, mtime)
+            cache_files = []
+            for directory in (self.cache_dir, self._prices_day_dir()):
+                if not directory.exists():
+                    continue
+                prefix = '' if directory == self.cache_dir else f"prices/{directory.name}/"
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(self.CACHE_SUFFIX):
+                            stat = entry.stat()
+                            cache_files.append((prefix + entry.name, stat.st_size, stat.st_mtime))
+            total_size = sum(size for _, size, _ in cache_files) / (1024 * 1024)
+            
+            # Mostrar solo los 10 más recientes
+            recent = sorted(cache_files, key=lambda f: f[2], reverse=True)[:10]
+            files_info = [
+                {
+                    'filename': name,
+                    'size_mb': round(size / (1024 * 1024), 2),
+                    'modified': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+                }
+                for name, size, mtime in recent
+            ]
             
             return {
                 'cache_directory': str(self.cache_dir),
                 'total_files': len(cache_files),
                 'total_size_mb': round(total_size, 2),
-                'files': files_info[:10]  # Mostrar solo los 10 más recientes
+                'files': files_info
             }
         except Exception as e:
-            logger.error(f"Error obteniendo información de caché: {e}")
+            logger.error("Error obteniendo información de caché: %s", e)
             return {'error': str(e)}
     
     def get_current_prices(self, symbols: Optional[List[str]] = None,
-                          use_cache: bool = True) -> pd.DataFrame:
+                          use_cache: bool = True, refresh: bool = False,
+                          sort: bool = False) -> pd.DataFrame:
         """
         Obtiene precios actuales de las acciones con sistema de caché inteligente
         
         Args:
             symbols: Lista de símbolos de acciones
             use_cache: Si usar el sistema de caché diario
+            refresh: Si ignorar los precios memorizados en memoria
+            sort: Si ordenar por change_percent descendente
             
         Returns:
             DataFrame con precios actuales
@@ -141,39 +618,50 @@ class YahooFinanceDataExtractor:
         if symbols is None:
             symbols = self.default_stocks
         
+        key = (tuple(sorted(symbols)), use_cache)
+        cached = self._prices_cache.get(key)
+        if not refresh and cached is not None and time.time() - cached[0] < self.PRICES_MEMO_TTL:
+            prices = cached[1]
+        else:
+            prices = self._get_current_prices(symbols, use_cache)
+            if not prices.empty:
+                now = time.time()
+                # Descartar las entradas vencidas para que la memo no crezca sin límite
+                for old_key, (stamp, _) in list(self._prices_cache.items()):
+                    if now - stamp >= self.PRICES_MEMO_TTL:
+                        self._prices_cache.pop(old_key, None)
+                self._prices_cache[key] = (now, prices)
+        
+        if sort and not prices.empty:
+            return prices.sort_values('change_percent', ascending=False).reset_index(drop=True)
+        return prices.copy()
+    
+    def _get_current_prices(self, symbols: List[str], use_cache: bool) -> pd.DataFrame:
+        """Obtiene precios actuales desde el caché diario o descargándolos"""
         if not use_cache:
             # Descargar todo sin caché
-            logger.info(f"Descargando precios actuales para {len(symbols)} acciones...")
+            logger.info("Descargando precios actuales para %s acciones...", len(symbols))
             return self._download_all_prices(symbols, use_cache=False)
         
         # Buscar caché existente y determinar qué acciones faltan
         cached_data, missing_symbols = self._get_cached_prices_and_missing(symbols)
         
+        if cached_data is None:
+            # Si no hay caché útil, descargar todo
+            logger.info("Descargando precios actuales para %s acciones...", len(symbols))
+            return self._download_all_prices(symbols, use_cache=True)
+        
         if not missing_symbols:
             # Todas las acciones están en caché
-            logger.info(f"Todos los precios cargados desde caché ({len(symbols)} acciones)")
-            return cached_data[cached_data['symbol'].isin(symbols)].reset_index(drop=True)
-        
-        # Descargar solo las acciones faltantes
-        if cached_data is not None and len(missing_symbols) < len(symbols):
-            logger.info(f"Caché parcial encontrado. Descargando {len(missing_symbols)} acciones nuevas...")
-            new_data = self._download_all_prices(missing_symbols, use_cache=False)
-            
-            if not new_data.empty:
-                # Combinar datos existentes con nuevos
-                combined_data = pd.concat([cached_data, new_data], ignore_index=True)
-                
-                # Guardar caché actualizado con todas las acciones
-                all_symbols_str = "_".join(sorted(list(set(symbols + list(cached_data['symbol'])))))
-                new_cache_filename = self._get_cache_filename("current_prices", all_symbols_str)
-                self._save_to_cache(combined_data, new_cache_filename)
-                
-                # Retornar solo las acciones solicitadas
-                return combined_data[combined_data['symbol'].isin(symbols)].reset_index(drop=True)
-        
-        # Si no hay caché útil, descargar todo
-        logger.info(f"Descargando precios actuales para {len(symbols)} acciones...")
-        return self._download_all_prices(symbols, use_cache=True)
+            logger.info("Todos los precios cargados desde caché (%s acciones)", len(symbols))
+            return cached_data
+        
+        # Descargar solo las acciones faltantes (se guardan como archivos nuevos del día)
+        logger.info("Caché parcial encontrado. Descargando %s acciones nuevas...", len(missing_symbols))
+        new_data = self._download_all_prices(missing_symbols, use_cache=True)
+        if new_data.empty:
+            return cached_data
+        return pd.concat([cached_data, new_data], ignore_index=True)
     
     def _get_cached_prices_and_missing(self, requested_symbols: List[str]) -> tuple:
         """
@@ -182,95 +670,96 @@ class YahooFinanceDataExtractor:
         Returns:
             tuple: (cached_dataframe, missing_symbols_list)
         """
-        today = datetime.now().strftime('%Y%m%d')
-        cache_files = list(self.cache_dir.glob(f"current_prices_*_{today}.csv"))
+        day_dir = self._prices_day_dir()
+        manifest = self._get_price_manifest()
+        cached_files = []
+        missing_symbols = []
+        for symbol in requested_symbols:
+            if symbol in manifest:
+                cached_files.append(str(day_dir / f"{symbol}{self.CACHE_SUFFIX}"))
+            else:
+                missing_symbols.append(symbol)
         
-        best_match = None
-        best_coverage = 0
+        if not cached_files:
+            return None, requested_symbols
         
-        for cache_file in cache_files:
-            try:
-                cached_df = pd.read_csv(cache_file, index_col=0)
-                if 'symbol' in cached_df.columns:
-                    cached_symbols = set(cached_df['symbol'].tolist())
-                    coverage = len(set(requested_symbols) & cached_symbols)
-                    
-                    if coverage > best_coverage:
-                        best_coverage = coverage
-                        best_match = cached_df
-                        
-            except Exception as e:
-                logger.warning(f"Error leyendo caché {cache_file.name}: {e}")
-                continue
-        
-        if best_match is not None:
-            cached_symbols = set(best_match['symbol'].tolist())
-            missing_symbols = [s for s in requested_symbols if s not in cached_symbols]
-            logger.info(f"Caché encontrado: {len(cached_symbols)} acciones, faltan {len(missing_symbols)}")
-            return best_match, missing_symbols
+        try:
+            # Lee solo los archivos de las acciones solicitadas en una sola pasada
+            cached_df = ds.dataset(cached_files, format='parquet').to_table().to_pandas()
+        except Exception as e:
+            # Archivos borrados o dañados desde fuera: volver a escanear en la próxima consulta
+            logger.warning("Error leyendo caché de precios: %s", e)
+            self._price_manifest = None
+            return None, requested_symbols
         
-        return None, requested_symbols
+        logger.info("Caché encontrado: %s acciones, faltan %s", len(cached_files), len(missing_symbols))
+        return cached_df, missing_symbols
     
     def _download_all_prices(self, symbols: List[str], use_cache: bool = True) -> pd.DataFrame:
         """
         Descarga precios para todas las acciones especificadas
+        Los precios se obtienen en una sola llamada batch a yf.download, sin consultar .info
         """
-        data_list = []
+        try:
+            panel = yf.download(
+                symbols, period="5d", group_by='ticker', auto_adjust=True,
+                threads=True, progress=False
+            )
+        except Exception as e:
+            logger.error("Error descargando precios: %s", e)
+            panel = pd.DataFrame()
         
-        def get_single_price(symbol):
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                hist = ticker.history(period="2d")
-                
-                if hist.empty:
-                    logger.warning(f"No hay datos para {symbol}")
-                    return None
-                
-                current_price = hist['Close'].iloc[-1]
-                previous_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                change = current_price - previous_price
-                change_pct = (change / previous_price) * 100 if previous_price != 0 else 0
-                
-                return {
-                    'symbol': symbol,
-                    'name': self.stock_names.get(symbol, symbol),
-                    'current_price': round(current_price, 2),
-                    'previous_price': round(previous_price, 2),
-                    'change': round(change, 2),
-                    'change_percent': round(change_pct, 2),
-                    'volume': hist['Volume'].iloc[-1] if 'Volume' in hist else 0,
-                    'market_cap': info.get('marketCap', 'N/A'),
-                    'currency': info.get('currency', 'CLP'),
-                    'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-            except Exception as e:
-                logger.error(f"Error obteniendo datos de {symbol}: {e}")
-                return None
+        if panel.empty:
+            logger.warning("No se obtuvieron precios para los símbolos proporcionados")
+            return pd.DataFrame()
         
-        # Usar ThreadPoolExecutor para obtener datos en paralelo
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(get_single_price, symbol): symbol for symbol in symbols}
-            
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    data_list.append(result)
+        if not isinstance(panel.columns, pd.MultiIndex):
+            panel = pd.concat({symbols[0]: panel}, axis=1)
+        
+        # Cálculo vectorizado sobre todas las acciones a la vez
+        closes = panel.xs('Close', level=1, axis=1).dropna(how='all')
+        volumes = panel.xs('Volume', level=1, axis=1).reindex(closes.index)
+        filled = closes.ffill()
+        current = filled.iloc[-1]
+        previous = filled.iloc[-2] if len(filled) > 1 else current
+        previous = previous.fillna(current)
+        change = current - previous
+        change_pct = (change / previous.replace(0, np.nan) * 100).fillna(0)
+        volume = volumes.where(closes.notna()).ffill().iloc[-1].fillna(0)
+        
+        available = [s for s in symbols if s in current.index and pd.notna(current[s])]
+        for symbol in symbols:
+            if symbol not in available:
+                logger.warning("No hay datos para %s", symbol)
         
-        df = pd.DataFrame(data_list)
-        logger.info(f"Datos obtenidos para {len(df)} acciones")
+        if not available:
+            return pd.DataFrame()
+        
+        # .info es el endpoint más lento de Yahoo: solo se usa el sidecar de metadatos
+        # (lo llena get_company_info); el resto queda con los valores por defecto.
+        # market_cap faltante va como NaN para que la columna sea numérica (Parquet)
+        infos = [self._ticker_info.get(s, {}) for s in available]
+        
+        df = pd.DataFrame({
+            'symbol': available,
+            'name': None,
+            'current_price': current[available].round(2).to_numpy(),
+            'previous_price': previous[available].round(2).to_numpy(),
+            'change': change[available].round(2).to_numpy(),
+            'change_percent': change_pct[available].round(2).to_numpy(),
+            'volume': volume[available].to_numpy(),
+            'market_cap': np.array([info.get('marketCap', np.nan) for info in infos], dtype=np.float64),
+            'currency': [info.get('currency', 'CLP') for info in infos],
+            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+        df['name'] = self._map_names(df['symbol'])
+        logger.info("Datos obtenidos para %s acciones", len(df))
         
         # Guardar en caché para futuros usos
         if use_cache and not df.empty:
-            symbols_str = "_".join(sorted(symbols))
-            cache_filename = self._get_cache_filename("current_prices", symbols_str)
-            self._save_to_cache(df, cache_filename)
+            self._save_prices_cache(df)
         
-        if df.empty or 'change_percent' not in df.columns:
-            logger.warning("No se pudieron calcular variaciones para los símbolos proporcionados")
-            return df.reset_index(drop=True)
-        
-        return df.sort_values('change_percent', ascending=False).reset_index(drop=True)
+        return df
     
     def get_historical_data(self, symbol: str, period: str = "1y") -> pd.DataFrame:
         """
@@ -283,28 +772,29 @@ class YahooFinanceDataExtractor:
         Returns:
             DataFrame con datos históricos
         """
+        self._refresh_today()
+        cached = self._hist_mem.get((symbol, period))
+        if cached is not None:
+            return cached.copy()
+        
         try:
-            logger.info(f"Obteniendo datos históricos de {symbol} para período {period}")
+            logger.debug("Obteniendo datos históricos de %s para período %s", symbol, period)
             
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = self._history(symbol, period)
             
             if hist.empty:
-                logger.warning(f"No hay datos históricos para {symbol}")
+                logger.warning("No hay datos históricos para %s", symbol)
                 return pd.DataFrame()
             
-            # Calcular indicadores técnicos básicos
-            hist = self._add_technical_indicators(hist)
+            # Calcular indicadores técnicos básicos y añadir información adicional
+            hist = self._finalize_historical(symbol, hist)
+            self._hist_mem[(symbol, period)] = hist
             
-            # Añadir información adicional
-            hist['symbol'] = symbol
-            hist['name'] = self.stock_names.get(symbol, symbol)
-            
-            logger.info(f"Datos históricos obtenidos: {len(hist)} registros")
-            return hist
+            logger.debug("Datos históricos obtenidos: %s registros", len(hist))
+            return hist.copy()
             
         except Exception as e:
-            logger.error(f"Error obteniendo datos históricos de {symbol}: {e}")
+            logger.error("Error obteniendo datos históricos de %s: %s", symbol, e)
             return pd.DataFrame()
     
     def get_multiple_historical_data(self, symbols: Optional[List[str]] = None,
@@ -333,12 +823,12 @@ class YahooFinanceDataExtractor:
         
         if not missing_symbols:
             # Todas las acciones están en caché
-            logger.info(f"Todos los datos históricos cargados desde caché ({len(symbols)} acciones)")
+            logger.info("Todos los datos históricos cargados desde caché (%s acciones)", len(symbols))
             return {k: v for k, v in cached_data.items() if k in symbols}
         
         # Descargar solo las acciones faltantes
         if cached_data and len(missing_symbols) < len(symbols):
-            logger.info(f"Caché histórico parcial encontrado. Descargando {len(missing_symbols)} acciones nuevas...")
+            logger.info("Caché histórico parcial encontrado. Descargando %s acciones nuevas...", len(missing_symbols))
             new_data = self._download_all_historical(missing_symbols, period, use_cache=False)
             
             if new_data:
@@ -360,36 +850,41 @@ class YahooFinanceDataExtractor:
         """
         Busca en el caché histórico y determina qué acciones faltan
         """
-        today = datetime.now().strftime('%Y%m%d')
-        cache_pattern = f"historical_{period}_*_{today}.csv"
+        today = self._refresh_today()
+        cache_pattern = f"historical_{period}_*_{today}{self.CACHE_SUFFIX}"
         cache_files = list(self.cache_dir.glob(cache_pattern))
         
+        requested = frozenset(requested_symbols)
         best_match = None
         best_coverage = 0
         
+        # Para elegir el mejor archivo basta con leer la columna de símbolos
         for cache_file in cache_files:
             try:
-                import pickle
-                with open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
+                cached_symbols = frozenset(pd.read_parquet(cache_file, engine='pyarrow', columns=['symbol'])['symbol'])
+                coverage = len(requested & cached_symbols)
                 
-                if isinstance(cached_data, dict):
-                    cached_symbols = set(cached_data.keys())
-                    coverage = len(set(requested_symbols) & cached_symbols)
+                if coverage > best_coverage:
+                    best_coverage = coverage
+                    best_match = cache_file
                     
-                    if coverage > best_coverage:
-                        best_coverage = coverage
-                        best_match = cached_data
-                        
             except Exception as e:
-                logger.warning(f"Error leyendo caché histórico {cache_file.name}: {e}")
+                logger.warning("Error leyendo caché histórico %s: %s", cache_file.name, e)
                 continue
         
         if best_match is not None:
-            cached_symbols = set(best_match.keys())
-            missing_symbols = [s for s in requested_symbols if s not in cached_symbols]
-            logger.info(f"Caché histórico encontrado: {len(cached_symbols)} acciones, faltan {len(missing_symbols)}")
-            return best_match, missing_symbols
+            try:
+                # Cargar solo las filas de las acciones solicitadas
+                cached_df = pd.read_parquet(best_match, engine='pyarrow',
+                                            filters=[('symbol', 'in', list(requested))])
+                cached_data = {symbol: hist for symbol, hist in cached_df.groupby('symbol', sort=False)}
+            except Exception as e:
+                logger.warning("Error leyendo caché histórico %s: %s", best_match.name, e)
+                return {}, requested_symbols
+            
+            missing_symbols = [s for s in requested_symbols if s not in cached_data]
+            logger.info("Caché histórico encontrado: %s acciones, faltan %s", len(cached_data), len(missing_symbols))
+            return cached_data, missing_symbols
         
         return {}, requested_symbols
     
@@ -397,21 +892,9 @@ class YahooFinanceDataExtractor:
         """
         Descarga datos históricos para todas las acciones especificadas
         """
-        logger.info(f"Descargando datos históricos de {len(symbols)} acciones")
+        logger.info("Descargando datos históricos de %s acciones", len(symbols))
         
-        historical_data = {}
-        
-        def get_single_historical(symbol):
-            return symbol, self.get_historical_data(symbol, period)
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(get_single_historical, symbol): symbol
-                      for symbol in symbols}
-            
-            for future in as_completed(futures):
-                symbol, data = future.result()
-                if not data.empty:
-                    historical_data[symbol] = data
+        historical_data = self._download_panel(symbols, period)
         
         # Guardar en caché
         if use_cache and historical_data:
@@ -423,16 +906,22 @@ class YahooFinanceDataExtractor:
     
     def _save_historical_cache(self, data: Dict[str, pd.DataFrame], cache_filename: str):
         """
-        Guarda datos históricos en el caché usando pickle
+        Guarda datos históricos en el caché como un único Parquet con columna symbol
+        Cada acción va en su propio row group, así el filtro por símbolo al leer
+        descarta las demás usando las estadísticas del archivo sin decodificarlas
         """
         try:
             cache_path = self.cache_dir / cache_filename
-            import pickle
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
-            logger.info(f"Datos históricos guardados en caché: {cache_filename}")
+            combined = pd.concat([hist.assign(symbol=symbol) for symbol, hist in data.items()])
+            table = pa.Table.from_pandas(combined, preserve_index=True)
+            with pq.ParquetWriter(cache_path, table.schema, compression='zstd') as writer:
+                offset = 0
+                for hist in data.values():
+                    writer.write_table(table.slice(offset, len(hist)))
+                    offset += len(hist)
+            logger.info("Datos históricos guardados en caché: %s", cache_filename)
         except Exception as e:
-            logger.warning(f"Error guardando caché histórico: {e}")
+            logger.warning("Error guardando caché histórico: %s", e)
 
     def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -445,46 +934,71 @@ class YahooFinanceDataExtractor:
             DataFrame con indicadores técnicos
         """
         try:
-            # Moving Averages
-            df['SMA_20'] = df['Close'].rolling(window=20).mean()
-            df['SMA_50'] = df['Close'].rolling(window=50).mean()
-            df['EMA_12'] = df['Close'].ewm(span=12).mean()
-            df['EMA_26'] = df['Close'].ewm(span=26).mean()
+            if NUMBA_AVAILABLE:
+                # Kernel compilado: todos los indicadores en una sola pasada, en float32
+                values = compute_indicators(df['Close'].to_numpy(dtype=np.float32))
+                # La salida (13, n) ya tiene el layout de un bloque de pandas: se une de una vez
+                indicators = pd.DataFrame(values.T, index=df.index, columns=list(INDICATOR_COLUMNS))
+                return pd.concat([df, indicators], axis=1)
+            
+            close = df['Close']
+            
+            # Moving Averages (la ventana de 20 se comparte con Bollinger)
+            rolling_20 = close.rolling(window=20)
+            sma_20 = rolling_20.mean()
+            bb_std = rolling_20.std()
+            ema_12 = close.ewm(span=12).mean()
+            ema_26 = close.ewm(span=26).mean()
             
             # MACD
-            df['MACD'] = df['EMA_12'] - df['EMA_26']
-            df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-            
-            # RSI
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Bollinger Bands
-            df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-            bb_std = df['Close'].rolling(window=20).std()
-            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-            
-            # Volatilidad
-            df['Daily_Return'] = df['Close'].pct_change()
-            df['Volatility'] = df['Daily_Return'].rolling(window=20).std() * np.sqrt(252)
+            macd = ema_12 - ema_26
+            macd_signal = macd.ewm(span=9).mean()
             
-            return df
+            # RSI (suavizado de Wilder sobre arreglos numpy)
+            # (ganancias y pérdidas suavizadas juntas en una sola llamada a ewm)
+            delta = np.nan_to_num(close.diff().to_numpy(), nan=0.0)
+            gain_loss = pd.DataFrame(
+                {'up': np.clip(delta, 0.0, None), 'dn': np.clip(-delta, 0.0, None)}, index=df.index
+            )
+            rolled = gain_loss.ewm(alpha=1/14, adjust=False, min_periods=14).mean()
+            rs = rolled['up'] / rolled['dn']
+            
+            # Retorno diario sobre cierres rellenados hacia adelante (igual que pct_change)
+            filled = close.ffill().to_numpy(dtype=np.float64)
+            daily_return = np.full(len(filled), np.nan)
+            daily_return[1:] = filled[1:] / filled[:-1] - 1
+            daily_return = pd.Series(daily_return, index=df.index)
+            
+            # Todas las columnas en una sola asignación, sin fragmentar el DataFrame
+            # (en float32, como las entrega el kernel compilado)
+            return df.assign(**{
+                'SMA_20': sma_20,
+                'SMA_50': close.rolling(window=50).mean(),
+                'EMA_12': ema_12,
+                'EMA_26': ema_26,
+                'MACD': macd,
+                'MACD_Signal': macd_signal,
+                'MACD_Histogram': macd - macd_signal,
+                'RSI': 100 - 100 / (1 + rs),
+                'BB_Middle': sma_20,
+                'BB_Upper': sma_20 + (bb_std * 2),
+                'BB_Lower': sma_20 - (bb_std * 2),
+                'Daily_Return': daily_return,
+                'Volatility': daily_return.rolling(window=20).std() * np.sqrt(252),
+            }).astype(dict.fromkeys(INDICATOR_COLUMNS, np.float32))
             
         except Exception as e:
-            logger.error(f"Error calculando indicadores técnicos: {e}")
+            logger.error("Error calculando indicadores técnicos: %s", e)
             return df
     
-    def get_market_summary(self, use_cache: bool = True) -> Dict:
+    def get_market_summary(self, use_cache: bool = True,
+                           current_prices: Optional[pd.DataFrame] = None) -> Dict:
         """
         Obtiene un resumen del mercado chileno con caché
         
         Args:
             use_cache: Si usar el sistema de caché diario
+            current_prices: Precios ya obtenidos con get_current_prices (opcional)
             
         Returns:
             Diccionario con resumen del mercado
@@ -493,32 +1007,31 @@ class YahooFinanceDataExtractor:
         
         # Intentar cargar desde caché
         if use_cache:
-            cache_path = self.cache_dir / cache_filename.replace('.csv', '.json')
+            cache_path = self.cache_dir / cache_filename.replace(self.CACHE_SUFFIX, '.json')
             if cache_path.exists():
                 try:
                     logger.info("Cargando resumen del mercado desde caché")
-                    import json
-                    with open(cache_path, 'r') as f:
-                        return json.load(f)
+                    return _load_json(cache_path)
                 except Exception as e:
-                    logger.warning(f"Error cargando caché de resumen: {e}")
+                    logger.warning("Error cargando caché de resumen: %s", e)
         
         logger.info("Generando resumen del mercado...")
         
-        current_data = self.get_current_prices(use_cache=use_cache)
+        current_data = self.get_current_prices(use_cache=use_cache) if current_prices is None else current_prices
         
         if current_data.empty:
             return {"error": "No se pudieron obtener datos del mercado"}
         
         # Estadísticas del mercado
+        change_percent = current_data['change_percent']
         total_stocks = len(current_data)
-        gainers = len(current_data[current_data['change_percent'] > 0])
-        losers = len(current_data[current_data['change_percent'] < 0])
+        gainers = int((change_percent > 0).sum())
+        losers = int((change_percent < 0).sum())
         unchanged = total_stocks - gainers - losers
         
-        # Top performers
-        top_gainer = current_data.iloc[0] if not current_data.empty else None
-        top_loser = current_data.iloc[-1] if not current_data.empty else None
+        # Top performers (sin depender del orden del DataFrame)
+        top_gainer = current_data.loc[change_percent.idxmax()]
+        top_loser = current_data.loc[change_percent.idxmin()]
         
         # Volumen total (donde esté disponible)
         total_volume = current_data['volume'].sum()
@@ -531,52 +1044,54 @@ class YahooFinanceDataExtractor:
             'unchanged': unchanged,
             'total_volume': int(total_volume),
             'top_gainer': {
-                'name': top_gainer['name'] if top_gainer is not None else 'N/A',
-                'symbol': top_gainer['symbol'] if top_gainer is not None else 'N/A',
-                'change_percent': top_gainer['change_percent'] if top_gainer is not None else 0
-            } if top_gainer is not None else None,
+                'name': top_gainer['name'],
+                'symbol': top_gainer['symbol'],
+                'change_percent': top_gainer['change_percent']
+            },
             'top_loser': {
-                'name': top_loser['name'] if top_loser is not None else 'N/A',
-                'symbol': top_loser['symbol'] if top_loser is not None else 'N/A',
-                'change_percent': top_loser['change_percent'] if top_loser is not None else 0
-            } if top_loser is not None else None,
+                'name': top_loser['name'],
+                'symbol': top_loser['symbol'],
+                'change_percent': top_loser['change_percent']
+            },
             'market_trend': 'Alcista' if gainers > losers else 'Bajista' if losers > gainers else 'Neutral'
         }
         
         # Guardar en caché
         if use_cache:
             try:
-                cache_path = self.cache_dir / cache_filename.replace('.csv', '.json')
-                import json
-                with open(cache_path, 'w') as f:
-                    json.dump(summary, f)
-                logger.info(f"Resumen del mercado guardado en caché")
+                cache_path = self.cache_dir / cache_filename.replace(self.CACHE_SUFFIX, '.json')
+                _dump_json(summary, cache_path)
+                logger.info("Resumen del mercado guardado en caché")
             except Exception as e:
-                logger.warning(f"Error guardando caché de resumen: {e}")
+                logger.warning("Error guardando caché de resumen: %s", e)
         
         logger.info("Resumen del mercado generado exitosamente")
         return summary
     
-    def get_market_movers(self, limit: int = 5) -> Dict[str, pd.DataFrame]:
+    def get_market_movers(self, limit: int = 5,
+                          current_prices: Optional[pd.DataFrame] = None) -> Dict[str, pd.DataFrame]:
         """
         Obtiene las acciones con mayor movimiento (ganadores y perdedores)
         
         Args:
             limit: Número de acciones por categoría
+            current_prices: Precios ya obtenidos con get_current_prices (opcional)
             
         Returns:
             Diccionario con ganadores y perdedores
         """
-        logger.info(f"Obteniendo top {limit} ganadores y perdedores...")
+        logger.info("Obteniendo top %s ganadores y perdedores...", limit)
         
-        current_data = self.get_current_prices()
+        current_data = self.get_current_prices() if current_prices is None else current_prices
         
         if current_data.empty:
             return {"gainers": pd.DataFrame(), "losers": pd.DataFrame()}
         
-        # Ordenar por cambio porcentual
-        gainers = current_data[current_data['change_percent'] > 0].head(limit)
-        losers = current_data[current_data['change_percent'] < 0].tail(limit)
+        # Top-k por cambio porcentual sin ordenar todo el DataFrame
+        # (perdedores de menor a mayor caída, como el final del orden descendente)
+        change = current_data['change_percent']
+        gainers = current_data[change > 0].nlargest(limit, 'change_percent')
+        losers = current_data[change < 0].nsmallest(limit, 'change_percent').iloc[::-1]
         
         return {
             'gainers': gainers[['name', 'symbol', 'current_price', 'change_percent', 'volume']],
@@ -597,23 +1112,20 @@ class YahooFinanceDataExtractor:
         if symbols is None:
             symbols = self.default_stocks[:6]  # Limitar para mejor visualización
             
-        logger.info(f"Calculando matriz de correlación para {len(symbols)} acciones")
-        
-        # Obtener datos históricos
-        prices_data = {}
-        for symbol in symbols:
-            hist = self.get_historical_data(symbol, period)
-            if not hist.empty:
-                prices_data[self.stock_names.get(symbol, symbol)] = hist['Close']
+        logger.info("Calculando matriz de correlación para %s acciones", len(symbols))
         
-        if not prices_data:
+        # Solo se necesitan los cierres: sin indicadores técnicos
+        histories = self._history_panel(symbols, period)
+        if not histories:
             return pd.DataFrame()
         
-        # Crear DataFrame y calcular correlación
-        prices_df = pd.DataFrame(prices_data)
-        correlation_matrix = prices_df.corr()
+        closes = pd.concat(
+            {self.stock_names.get(s, s): histories[s]['Close'] for s in symbols if s in histories},
+            axis=1
+        )
         
-        return correlation_matrix
+        # Correlación de retornos diarios (los niveles de precio dan correlaciones espurias)
+        return closes.pct_change().corr()
     
     def get_sector_performance(self, use_cache: bool = True) -> Dict[str, Dict]:
         """
@@ -629,14 +1141,13 @@ class YahooFinanceDataExtractor:
         
         # Intentar cargar desde caché
         if use_cache:
-            cache_path = self.cache_dir / cache_filename.replace('.csv', '.json')
+            cache_path = self.cache_dir / cache_filename.replace(self.CACHE_SUFFIX, '.json')
             if cache_path.exists():
                 try:
                     logger.info("Cargando rendimiento sectorial desde caché")
-                    with open(cache_path, 'r') as f:
-                        return json.load(f)
+                    return _load_json(cache_path)
                 except Exception as e:
-                    logger.warning(f"Error cargando caché sectorial: {e}")
+                    logger.warning("Error cargando caché sectorial: %s", e)
         
         logger.info("Calculando rendimiento por sectores...")
         
@@ -645,49 +1156,103 @@ class YahooFinanceDataExtractor:
         if current_data.empty:
             return {}
         
-        sector_data = {}
+        # Información sectorial de todas las acciones en paralelo (.info cacheado)
+        # (pool.map conserva el orden de las filas, así que la columna se asigna directo)
+        infos = self._pool.map(self.get_company_info, current_data['symbol'])
+        current_data = current_data.assign(sector=[info.get('sector', 'Unknown') for info in infos])
+        
+        # Agregación vectorizada por sector
+        grouped = current_data.groupby('sector', sort=False)
+        agg = grouped['change_percent'].agg(total_change='sum', count='size', avg_change='mean')
+        companies = {
+            sector: current_data.loc[index, ['name', 'change_percent']].to_dict('records')
+            for sector, index in grouped.groups.items()
+        }
         
-        # Obtener información sectorial para cada acción
-        for _, row in current_data.iterrows():
-            company_info = self.get_company_info(row['symbol'])
-            sector = company_info.get('sector', 'Unknown')
-            
-            if sector not in sector_data:
-                sector_data[sector] = {
-                    'companies': [],
-                    'total_change': 0,
-                    'count': 0,
-                    'avg_change': 0
-                }
-            
-            sector_data[sector]['companies'].append({
-                'name': row['name'],
-                'change_percent': row['change_percent']
-            })
-            sector_data[sector]['total_change'] += row['change_percent']
-            sector_data[sector]['count'] += 1
-        
-        # Calcular promedios
-        for sector in sector_data:
-            if sector_data[sector]['count'] > 0:
-                sector_data[sector]['avg_change'] = (
-                    sector_data[sector]['total_change'] / sector_data[sector]['count']
-                )
+        sector_data = {
+            sector: {
+                'companies': companies[sector],
+                'total_change': float(stats['total_change']),
+                'count': int(stats['count']),
+                'avg_change': float(stats['avg_change'])
+            }
+            for sector, stats in agg.to_dict('index').items()
+        }
         
         # Guardar en caché
         if use_cache and sector_data:
             try:
-                cache_path = self.cache_dir / cache_filename.replace('.csv', '.json')
-                with open(cache_path, 'w') as f:
-                    json.dump(sector_data, f)
+                cache_path = self.cache_dir / cache_filename.replace(self.CACHE_SUFFIX, '.json')
+                _dump_json(sector_data, cache_path)
                 logger.info("Rendimiento sectorial guardado en caché")
             except Exception as e:
-                logger.warning(f"Error guardando caché sectorial: {e}")
-        
-        return sector_data
+                logger.warning("Error guardando caché sectorial: %s", e)
         
         return sector_data
     
+    @staticmethod
+    def _volatility_tail(closes: np.ndarray, window: int = 20) -> tuple:
+        """
+        Volatilidad anualizada actual y promedio a partir de los cierres
+        Equivale a Volatility.iloc[-1] y Volatility.mean() de _add_technical_indicators
+        """
+        returns = closes[1:] / closes[:-1] - 1
+        if len(returns) < window:
+            return np.nan, np.nan
+        annualization = np.sqrt(252)
+        current = returns[-window:].std(ddof=1)
+        
+        # Desviación de cada ventana con sumas acumuladas: O(n) en vez de O(n * window)
+        sums = np.concatenate(([0.0], np.cumsum(returns)))
+        sq_sums = np.concatenate(([0.0], np.cumsum(returns * returns)))
+        s1 = sums[window:] - sums[:-window]
+        s2 = sq_sums[window:] - sq_sums[:-window]
+        rolling_std = np.sqrt(np.maximum((s2 - s1 * s1 / window) / (window - 1), 0.0))
+        return current * annualization, rolling_std.mean() * annualization
+    
+    @staticmethod
+    def _latest_indicators(closes: np.ndarray) -> Dict:
+        """
+        Último valor de los indicadores usados por get_trading_signals
+        Equivale a la última fila de _add_technical_indicators sin construir columnas
+        """
+        n = len(closes)
+        last_20 = closes[-20:]
+        sma_20 = last_20.mean() if n >= 20 else np.nan
+        bb_std = last_20.std(ddof=1) if n >= 20 else np.nan
+        sma_50 = closes[-50:].mean() if n >= 50 else np.nan
+        
+        # EMAs (adjust=True) y señal MACD: recurrencia compilada que solo mantiene el estado
+        ema_12, ema_26, macd_signal = ema_macd_last(closes)
+        macd = ema_12 - ema_26
+        
+        # RSI de Wilder (adjust=False): forma cerrada de la EWMA como producto punto
+        rsi = np.nan
+        if n >= 14:
+            delta = np.diff(closes)
+            weights = (1 - 1 / 14) ** np.arange(len(delta) - 1, -1, -1) / 14
+            roll_up = weights @ np.maximum(delta, 0.0)
+            roll_dn = weights @ np.maximum(-delta, 0.0)
+            if roll_dn > 0:
+                rsi = 100 - 100 / (1 + roll_up / roll_dn)
+            elif roll_up > 0:
+                rsi = 100.0
+        
+        # Floats de Python: comparaciones escalares baratas y salida serializable tal cual
+        latest = {
+            'Close': closes[-1],
+            'SMA_20': sma_20,
+            'SMA_50': sma_50,
+            'EMA_12': ema_12,
+            'EMA_26': ema_26,
+            'MACD': macd,
+            'MACD_Signal': macd_signal,
+            'RSI': rsi,
+            'BB_Upper': sma_20 + 2 * bb_std,
+            'BB_Lower': sma_20 - 2 * bb_std,
+        }
+        return {name: float(value) for name, value in latest.items()}
+    
     def get_volatility_ranking(self, period: str = "1mo", custom_symbols: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Obtiene ranking de volatilidad de las acciones
@@ -700,25 +1265,28 @@ class YahooFinanceDataExtractor:
             DataFrame con ranking de volatilidad
         """
         symbols = custom_symbols if custom_symbols else self.default_stocks
-        logger.info(f"Calculando ranking de volatilidad para período {period}")
+        logger.info("Calculando ranking de volatilidad para período %s", period)
         
-        volatility_data = []
-        
-        for symbol in symbols:
-            hist = self.get_historical_data(symbol, period)
-            if not hist.empty and 'Volatility' in hist.columns:
-                current_volatility = hist['Volatility'].iloc[-1]
-                avg_volatility = hist['Volatility'].mean()
-                
-                volatility_data.append({
-                    'symbol': symbol,
-                    'name': self.stock_names.get(symbol, symbol),
-                    'current_volatility': round(current_volatility * 100, 2),
-                    'avg_volatility': round(avg_volatility * 100, 2),
-                    'volatility_rank': 'High' if current_volatility > 0.3 else 'Medium' if current_volatility > 0.15 else 'Low'
-                })
-        
-        df = pd.DataFrame(volatility_data)
+        # Solo se necesitan los cierres: sin calcular el resto de indicadores
+        histories = self._history_panel(symbols, period)
+        if not histories:
+            return pd.DataFrame()
+        tails = np.array([
+            self._volatility_tail(hist['Close'].to_numpy(dtype=np.float64))
+            for hist in histories.values()
+        ])
+        current_volatility, avg_volatility = tails.T
+        
+        # Redondeo y clasificación sobre los arreglos completos
+        df = pd.DataFrame({
+            'symbol': list(histories),
+            'current_volatility': (current_volatility * 100).round(2),
+            'avg_volatility': (avg_volatility * 100).round(2),
+            'volatility_rank': np.select(
+                [current_volatility > 0.3, current_volatility > 0.15], ['High', 'Medium'], 'Low'
+            ),
+        })
+        df.insert(1, 'name', self._map_names(df['symbol']))
         return df.sort_values('current_volatility', ascending=False)
     
     def get_trading_signals(self, symbol: str, period: str = "3mo") -> Dict:
@@ -732,53 +1300,129 @@ class YahooFinanceDataExtractor:
         Returns:
             Diccionario con señales de trading
         """
-        logger.info(f"Generando señales de trading para {symbol}")
+        logger.info("Generando señales de trading para %s", symbol)
         
-        hist = self.get_historical_data(symbol, period)
+        try:
+            hist = self._history(symbol, period)
+        except Exception as e:
+            logger.error("Error obteniendo datos históricos de %s: %s", symbol, e)
+            hist = pd.DataFrame()
         
-        if hist.empty:
+        closes = hist['Close'].dropna().to_numpy(dtype=np.float64) if not hist.empty else ()
+        if not len(closes):
+            logger.warning("No hay datos históricos para %s", symbol)
             return {'symbol': symbol, 'error': 'No data available'}
         
-        latest = hist.iloc[-1]
-        signals = {
+        # Estados por indicador -> lista de señales precalculada (sin cascada de ifs ni DataFrame)
+        latest = self._latest_indicators(closes)
+        values = np.array([[latest[name] for name in self.SIGNAL_INDICATORS]])
+        states = tuple(self._signal_states(values)[0].tolist())
+        signal_list = [dict(signal) for signal in _SIGNAL_TABLE[states]]
+        if states[1]:
+            next(signal for signal in signal_list if signal['indicator'] == 'RSI')['value'] = round(latest['RSI'], 2)
+        
+        return {
             'symbol': symbol,
             'name': self.stock_names.get(symbol, symbol),
             'last_price': round(latest['Close'], 2),
-            'signals': []
+            'signals': signal_list
         }
+    
+    @staticmethod
+    def _signal_states(values: np.ndarray) -> np.ndarray:
+        """
+        Estado de cada indicador (índice en _SIGNAL_GROUPS) por fila de la matriz (N, 8)
+        de SIGNAL_INDICATORS; np.select toma la primera condición verdadera, como un if/elif
+        """
+        close, sma_20, sma_50, rsi, macd, macd_signal, bb_upper, bb_lower = values.T
+        above_20 = close > sma_20
+        return np.column_stack([
+            np.select([above_20 & (sma_20 > sma_50), above_20, (close < sma_20) & (sma_20 < sma_50)], [1, 2, 3], 0),
+            np.select([rsi > 70, rsi < 30], [1, 2], 0),
+            np.where(macd > macd_signal, 0, 1),
+            np.select([close > bb_upper, close < bb_lower], [1, 2], 0),
+        ])
+    
+    def get_trading_signals_bulk(self, symbols: Optional[List[str]] = None, period: str = "3mo") -> pd.DataFrame:
+        """
+        Señales de trading de varias acciones en una sola pasada vectorizada
         
-        # Señal de Media Móvil
-        if 'SMA_20' in hist.columns and 'SMA_50' in hist.columns:
-            if latest['Close'] > latest['SMA_20'] > latest['SMA_50']:
-                signals['signals'].append({'type': 'Bullish', 'indicator': 'Moving Average', 'strength': 'Strong'})
-            elif latest['Close'] > latest['SMA_20']:
-                signals['signals'].append({'type': 'Bullish', 'indicator': 'Moving Average', 'strength': 'Moderate'})
-            elif latest['Close'] < latest['SMA_20'] < latest['SMA_50']:
-                signals['signals'].append({'type': 'Bearish', 'indicator': 'Moving Average', 'strength': 'Strong'})
-        
-        # Señal RSI
-        if 'RSI' in hist.columns:
-            rsi = latest['RSI']
-            if rsi > 70:
-                signals['signals'].append({'type': 'Bearish', 'indicator': 'RSI', 'strength': 'Overbought', 'value': round(rsi, 2)})
-            elif rsi < 30:
-                signals['signals'].append({'type': 'Bullish', 'indicator': 'RSI', 'strength': 'Oversold', 'value': round(rsi, 2)})
-        
-        # Señal MACD
-        if 'MACD' in hist.columns and 'MACD_Signal' in hist.columns:
-            if latest['MACD'] > latest['MACD_Signal']:
-                signals['signals'].append({'type': 'Bullish', 'indicator': 'MACD', 'strength': 'Positive Crossover'})
-            else:
-                signals['signals'].append({'type': 'Bearish', 'indicator': 'MACD', 'strength': 'Negative Crossover'})
+        Args:
+            symbols: Lista de símbolos (por defecto las acciones principales)
+            period: Período de datos
+            
+        Returns:
+            DataFrame con una fila por señal: symbol, name, last_price, type,
+            indicator, strength (categóricas) y value (solo RSI); las acciones
+            sin datos se omiten. to_dict('records') entrega la forma de diccionarios
+        """
+        if symbols is None:
+            symbols = self.default_stocks
+        # Sin duplicados (conservando el orden): una fila de indicadores por acción
+        symbols = list(dict.fromkeys(symbols))
         
-        # Señal Bollinger Bands
-        if all(col in hist.columns for col in ['BB_Upper', 'BB_Lower']):
-            if latest['Close'] > latest['BB_Upper']:
-                signals['signals'].append({'type': 'Bearish', 'indicator': 'Bollinger Bands', 'strength': 'Above Upper Band'})
-            elif latest['Close'] < latest['BB_Lower']:
-                signals['signals'].append({'type': 'Bullish', 'indicator': 'Bollinger Bands', 'strength': 'Below Lower Band'})
+        # Última fila de indicadores por acción en una matriz (N, 8)
+        histories = self._history_panel(symbols, period)
+        found = []
+        values = np.empty((len(symbols), len(self.SIGNAL_INDICATORS)))
+        for symbol in symbols:
+            hist = histories.get(symbol)
+            closes = hist['Close'].dropna().to_numpy(dtype=np.float64) if hist is not None else ()
+            if not len(closes):
+                continue
+            latest = self._latest_indicators(closes)
+            values[len(found)] = [latest[name] for name in self.SIGNAL_INDICATORS]
+            found.append(symbol)
+        values = values[:len(found)]
+        close, rsi = values[:, 0], values[:, 3]
+        states = self._signal_states(values)
+        
+        # Código (type, indicator, strength) de cada estado, en la misma tabla que usa get_trading_signals
+        state_codes = np.zeros((len(_SIGNAL_GROUPS), max(map(len, _SIGNAL_GROUPS)), 3), dtype=np.uint8)
+        for g, group in enumerate(_SIGNAL_GROUPS):
+            for state, signal in enumerate(group):
+                if signal is not None:
+                    kind, source, strength = signal
+                    state_codes[g, state] = (self.SIGNAL_TYPES.index(kind), self.SIGNAL_SOURCES.index(source),
+                                             self.SIGNAL_STRENGTHS.index(strength))
+        
+        # nonzero recorre la matriz (acción, indicador) por filas: señales agrupadas por acción
+        emitted = np.column_stack([
+            states[:, g] != 0 if group[0] is None else np.ones(len(found), dtype=bool)
+            for g, group in enumerate(_SIGNAL_GROUPS)
+        ]).reshape(len(found), len(_SIGNAL_GROUPS))
+        hits, group_idx = np.nonzero(emitted)
+        codes = state_codes[group_idx, states[hits, group_idx]].reshape(-1, 3)
+        is_rsi = codes[:, 1] == self.SIGNAL_SOURCES.index('RSI')
+        
+        # Etiquetas como categóricas: un código uint8 por fila en vez de un str por celda
+        df = pd.DataFrame({
+            'symbol': np.array(found, dtype=object)[hits],
+            'last_price': close[hits].round(2),
+            'type': pd.Categorical.from_codes(codes[:, 0], categories=self.SIGNAL_TYPES),
+            'indicator': pd.Categorical.from_codes(codes[:, 1], categories=self.SIGNAL_SOURCES),
+            'strength': pd.Categorical.from_codes(codes[:, 2], categories=self.SIGNAL_STRENGTHS),
+            'value': np.where(is_rsi, rsi[hits].round(2), np.nan),
+        })
+        df.insert(1, 'name', self._map_names(df['symbol']))
+        return df
+    
+    def save_data(self, output_dir: str = "data/processed", output_format: str = "parquet") -> Dict[str, str]:
+        """
+        Guarda todos los datos en el formato indicado
         
-        return signals
+        Args:
+            output_dir: Directorio de salida
+            output_format: 'parquet' (más rápido y liviano) o 'csv' (legible por personas)
+            
+        Returns:
+            Diccionario con rutas de archivos guardados
+        """
+        if output_format == 'parquet':
+            return self.save_data_to_parquet(output_dir)
+        if output_format == 'csv':
+            return self.save_data_to_csv(output_dir)
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
 
     def save_data_to_csv(self, output_dir: str = "data/processed") -> Dict[str, str]:
         """
@@ -790,56 +1434,77 @@ class YahooFinanceDataExtractor:
         Returns:
             Diccionario con rutas de archivos guardados
         """
-        from pathlib import Path
-        import os
+        return self._save_datasets(output_dir, 'csv', _write_csv)
+
+    def save_data_to_parquet(self, output_dir: str = "data/processed") -> Dict[str, str]:
+        """
+        Guarda todos los datos en archivos Parquet (snappy), más livianos que CSV
+        y conservando los tipos de datos al volver a leerlos
+        
+        Args:
+            output_dir: Directorio de salida
+            
+        Returns:
+            Diccionario con rutas de archivos guardados
+        """
+        def write_parquet(df, filepath, index=True):
+            df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=index)
         
+        return self._save_datasets(output_dir, 'parquet', write_parquet)
+
+    def _save_datasets(self, output_dir: str, extension: str, writer) -> Dict[str, str]:
+        """
+        Obtiene precios, históricos, correlación y volatilidad y los escribe con writer
+        Cada archivo se escribe en el pool de threads apenas sus datos están listos,
+        en paralelo con las escrituras y consultas siguientes
+        """
         # Crear directorio si no existe
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        saved_files = {}
+        writes = {}  # future -> (clave, ruta), en orden de envío
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        def submit(key, data, filename, **kwargs):
+            filepath = output_path / filename
+            writes[self._pool.submit(writer, data, filepath, **kwargs)] = (key, str(filepath))
+        
         try:
             # Precios actuales
             current_prices = self.get_current_prices()
             if not current_prices.empty:
-                filename = f"current_prices_{timestamp}.csv"
-                filepath = output_path / filename
-                current_prices.to_csv(filepath, index=False)
-                saved_files['current_prices'] = str(filepath)
+                submit('current_prices', current_prices, f"current_prices_{timestamp}.{extension}", index=False)
             
             # Datos históricos de acciones principales
             historical_data = self.get_multiple_historical_data(period="1y")
             for symbol, data in historical_data.items():
                 if not data.empty:
-                    clean_symbol = symbol.replace('.SN', '').replace('-', '_')
-                    filename = f"historical_{clean_symbol}_{timestamp}.csv"
-                    filepath = output_path / filename
-                    data.to_csv(filepath)
-                    saved_files[f'historical_{clean_symbol}'] = str(filepath)
+                    clean_symbol = self._clean_symbols.get(symbol) or self._clean_symbol(symbol)
+                    submit(f'historical_{clean_symbol}', data, f"historical_{clean_symbol}_{timestamp}.{extension}")
             
             # Matriz de correlación
             correlation = self.get_correlation_matrix()
             if not correlation.empty:
-                filename = f"correlation_matrix_{timestamp}.csv"
-                filepath = output_path / filename
-                correlation.to_csv(filepath)
-                saved_files['correlation_matrix'] = str(filepath)
+                submit('correlation_matrix', correlation, f"correlation_matrix_{timestamp}.{extension}")
             
             # Ranking de volatilidad
             volatility = self.get_volatility_ranking()
             if not volatility.empty:
-                filename = f"volatility_ranking_{timestamp}.csv"
-                filepath = output_path / filename
-                volatility.to_csv(filepath, index=False)
-                saved_files['volatility_ranking'] = str(filepath)
-            
-            logger.info(f"Datos guardados en {len(saved_files)} archivos en {output_path}")
+                submit('volatility_ranking', volatility, f"volatility_ranking_{timestamp}.{extension}", index=False)
             
         except Exception as e:
-            logger.error(f"Error guardando datos: {e}")
+            logger.error("Error guardando datos: %s", e)
         
+        # Un archivo que falla no impide registrar los demás
+        saved_files = {}
+        for future, (key, filepath) in writes.items():
+            try:
+                future.result()
+                saved_files[key] = filepath
+            except Exception as e:
+                logger.error("Error guardando %s: %s", filepath, e)
+        
+        logger.info("Datos guardados en %s archivos en %s", len(saved_files), output_path)
         return saved_files
 
     def get_company_info(self, symbol: str) -> Dict:
@@ -851,10 +1516,14 @@ class YahooFinanceDataExtractor:
         Returns:
             Diccionario con información de la empresa
         """
+        self._refresh_today()
+        cached = self._info_mem.get(symbol)
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            logger.info(f"Obteniendo información de {symbol}")
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            logger.debug("Obteniendo información de %s", symbol)
+            info = self._info(symbol)
             # Datos básicos
             company_data = {
                 'symbol': symbol,
@@ -879,10 +1548,11 @@ class YahooFinanceDataExtractor:
                 'website': info.get('website', 'N/A'),
                 'business_summary': info.get('longBusinessSummary', 'N/A')
             }
-            logger.info(f"Información de {symbol} obtenida exitosamente")
-            return company_data
+            self._info_mem[symbol] = company_data
+            logger.debug("Información de %s obtenida exitosamente", symbol)
+            return dict(company_data)
         except Exception as e:
-            logger.error(f"Error obteniendo información de {symbol}: {e}")
+            logger.error("Error obteniendo información de %s: %s", symbol, e)
             return {'symbol': symbol, 'error': str(e)}
 
 # Función de utilidad para ejecutar el módulo directamente
@@ -892,8 +1562,11 @@ def main():
     """Función principal para probar el módulo"""
     extractor = YahooFinanceDataExtractor()
     
+    # Una sola consulta de precios para el resumen y los movers
+    current_prices = extractor.get_current_prices()
+    
     print("=== RESUMEN DEL MERCADO ===")
-    market_summary = extractor.get_market_summary()
+    market_summary = extractor.get_market_summary(current_prices=current_prices)
     print(f"Acciones analizadas: {market_summary['total_stocks']}")
     print(f"Subiendo: {market_summary['gainers']}")
     print(f"Bajando: {market_summary['losers']}")
@@ -906,17 +1579,20 @@ def main():
         )
     
     print("\n=== TOP 3 GANADORES Y PERDEDORES ===")
-    movers = extractor.get_market_movers(limit=3)
+    movers = extractor.get_market_movers(limit=3, current_prices=current_prices)
     
+    # change_percent ya viene redondeado a 2 decimales: se imprime directo desde los arreglos
     print("\nGanadores:")
-    if not movers['gainers'].empty:
-        for _, row in movers['gainers'].iterrows():
-            print(f"  {row['name']}: +{row['change_percent']:.2f}%")
+    gainers = movers['gainers']
+    if not gainers.empty:
+        for name, change in zip(gainers['name'].to_numpy(), gainers['change_percent'].to_numpy()):
+            print(f"  {name}: +{change:.2f}%")
     
     print("\nPerdedores:")
-    if not movers['losers'].empty:
-        for _, row in movers['losers'].iterrows():
-            print(f"  {row['name']}: {row['change_percent']:.2f}%")
+    losers = movers['losers']
+    if not losers.empty:
+        for name, change in zip(losers['name'].to_numpy(), losers['change_percent'].to_numpy()):
+            print(f"  {name}: {change:.2f}%")
     
     print("\n=== RANKING DE VOLATILIDAD ===")
     volatility = extractor.get_volatility_ranking()
@@ -938,12 +1614,15 @@ def main():
             )
     
     print("\n=== GUARDANDO DATOS ===")
-    saved_files = extractor.save_data_to_csv()
+    saved_files = extractor.save_data()
     print(f"Archivos guardados: {len(saved_files)}")
     for file_type, filepath in saved_files.items():
         print(f"  {file_type}: {filepath}")
+    
+    extractor.close()
 
 
   
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -4,6 +4,7 @@ Incluye configuración avanzada y análisis detallado
 """
 
 import streamlit as st
+import atexit
 import sys
 import time
 from pathlib import Path
@@ -18,11 +19,22 @@ sys.path.append(str(src_path))
 from data_sources.yahoo_finance import YahooFinanceDataExtractor
 
 
+@st.cache_resource
+def get_extractor():
+    """
+    Extractor único compartido por todas las páginas y reruns de la app
+    Se cierra al terminar el proceso para guardar el sidecar de metadatos
+    """
+    extractor = YahooFinanceDataExtractor()
+    atexit.register(extractor.close)
+    return extractor
+
+
 def show_advanced_analytics():
     """Página de análisis avanzado"""
     st.title("🔬 Análisis Avanzado")
     
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     
     # Información del caché
     # with st.expander("📋 Estado del Sistema de Caché"):
@@ -123,7 +135,7 @@ def show_market_overview():
     """Página de resumen del mercado"""
     st.title("🏛️ Resumen del Mercado")
     
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     
     # Información del caché en la parte superior
     # with st.expander("⚡ Información de Rendimiento"):
@@ -142,7 +154,7 @@ def show_market_overview():
     with st.spinner("Cargando datos del mercado..."):
         start_time = time.time()
         market_summary = extractor.get_market_summary()
-        current_prices = extractor.get_current_prices()
+        current_prices = extractor.get_current_prices(sort=True)
         sector_performance = extractor.get_sector_performance()
         load_time = time.time() - start_time
         
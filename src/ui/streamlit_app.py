@@ -17,9 +17,8 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent
 sys.path.append(str(src_path))
 
-from data_sources.yahoo_finance import YahooFinanceDataExtractor
 from utils.config import get_config
-from ui.pages import PAGES, show_advanced_analytics, show_market_overview, show_settings
+from ui.pages import PAGES, get_extractor, show_advanced_analytics, show_market_overview, show_settings
 from ui.investment_page import show_investment_analysis
 
 # Configuración de la página
@@ -68,7 +67,7 @@ st.markdown("""
 @st.cache_data(ttl=300)  # Cache por 5 minutos
 def load_market_data(custom_tickers=None):
     """Carga datos del mercado con cache, incluyendo tickers personalizados"""
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     
     # Combinar tickers predeterminados con personalizados
     if custom_tickers:
@@ -78,7 +77,7 @@ def load_market_data(custom_tickers=None):
         combined_symbols = extractor.default_stocks
     
     # Obtener precios actuales para todos los símbolos
-    current_prices = extractor.get_current_prices(combined_symbols)
+    current_prices = extractor.get_current_prices(combined_symbols, sort=True)
     
     # Crear resumen basado en los datos realmente obtenidos
     if not current_prices.empty:
@@ -127,7 +126,7 @@ def load_market_data(custom_tickers=None):
 
 def get_all_symbols(custom_tickers=None):
     """Obtiene todos los símbolos (predeterminados + personalizados)"""
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     default_symbols = extractor.default_stocks
     
     if custom_tickers:
@@ -138,14 +137,14 @@ def get_all_symbols(custom_tickers=None):
 @st.cache_data(ttl=3600)  # Cache por 1 hora
 def load_historical_data(symbols, period="6mo"):
     """Carga datos históricos con cache"""
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     return extractor.get_multiple_historical_data(symbols, period)
 
 
 @st.cache_data(ttl=3600)  # Cache por 1 hora
 def load_correlation_matrix(custom_tickers=None):
     """Carga matriz de correlación con cache"""
-    extractor = YahooFinanceDataExtractor()
+    extractor = get_extractor()
     
     if custom_tickers:
         combined_symbols = get_all_symbols(custom_tickers)
@@ -333,7 +332,7 @@ def display_trading_signals(symbol):
     st.subheader("🎯 Señales de Trading")
     
     try:
-        extractor = YahooFinanceDataExtractor()
+        extractor = get_extractor()
         signals = extractor.get_trading_signals(symbol)  # Pasar el símbolo directamente
         
         if 'error' not in signals:
@@ -6,6 +6,7 @@ Demuestra cómo se agregan nuevas acciones al caché existente sin redescargar t
 
 import sys
 import time
+from datetime import datetime
 from pathlib import Path
 
 # Agregar el directorio src al path
@@ -24,7 +25,8 @@ def test_incremental_cache():
     
     # Limpiar caché previo para la demostración
     cache_dir = extractor.cache_dir
-    for cache_file in cache_dir.glob("current_prices_*_20250908.csv"):
+    today = datetime.now().strftime('%Y%m%d')
+    for cache_file in (cache_dir / "prices" / today).glob(f"*{extractor.CACHE_SUFFIX}"):
         cache_file.unlink()
         print(f"🗑️  Limpiado: {cache_file.name}")
     
@@ -163,7 +165,8 @@ def test_historical_incremental_cache():
     
     # Limpiar caché histórico previo
     cache_dir = extractor.cache_dir
-    for cache_file in cache_dir.glob("historical_*_20250908.csv"):
+    today = datetime.now().strftime('%Y%m%d')
+    for cache_file in cache_dir.glob(f"historical_*_{today}{extractor.CACHE_SUFFIX}"):
         cache_file.unlink()
         print(f"🗑️  Limpiado caché histórico: {cache_file.name}")
     
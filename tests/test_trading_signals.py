@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Prueba de get_trading_signals_bulk con símbolos repetidos y sin datos
+Usa históricos sintéticos en lugar de descargar desde Yahoo Finance
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+
+from data_sources.yahoo_finance import YahooFinanceDataExtractor
+
+
+class OfflineExtractor(YahooFinanceDataExtractor):
+    """Extractor con históricos sintéticos para SQM-B.SN y CHILE.SN"""
+
+    def _history_panel(self, symbols, period):
+        rng = np.random.default_rng(0)
+        histories = {}
+        for symbol in ("SQM-B.SN", "CHILE.SN"):
+            if symbol in symbols:
+                closes = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, 120)))
+                histories[symbol] = pd.DataFrame(
+                    {'Close': closes}, index=pd.date_range('2024-01-01', periods=120)
+                )
+        return histories
+
+
+def test_bulk_signals_duplicates_and_missing():
+    extractor = OfflineExtractor()
+    try:
+        symbols = ["SQM-B.SN", "CHILE.SN", "SQM-B.SN", "NOEXISTE.SN", "CHILE.SN"]
+        signals = extractor.get_trading_signals_bulk(symbols)
+
+        # Cada acción con datos aparece una vez y en el orden pedido; la faltante se omite
+        assert list(dict.fromkeys(signals['symbol'])) == ["SQM-B.SN", "CHILE.SN"]
+        assert not signals.duplicated(['symbol', 'indicator']).any()
+
+        # La señal MACD se emite siempre: una por acción con datos
+        assert (signals['indicator'] == 'MACD').sum() == 2
+
+        # Solo símbolos sin datos: DataFrame vacío en vez de error
+        assert extractor.get_trading_signals_bulk(["NOEXISTE.SN", "NOEXISTE.SN"]).empty
+        print("✅ get_trading_signals_bulk maneja símbolos repetidos y sin datos")
+    finally:
+        extractor.close()
+
+
+if __name__ == "__main__":
+    test_bulk_signals_duplicates_and_missing()